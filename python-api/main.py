@@ -1,35 +1,36 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Request, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
 import uvicorn
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageStat, UnidentifiedImageError
 import io
 import torch
-import torch.nn.functional as F
 from transformers import (
     BlipProcessor, BlipForConditionalGeneration, 
     Blip2Processor, Blip2ForConditionalGeneration,
-    AutoProcessor, AutoModelForCausalLM,
-    pipeline,
-    AutoTokenizer,
-    AutoModelForSequenceClassification
+    BitsAndBytesConfig
 )
 import logging
+import math
 import os
-import requests
+import random
 import re
+import time
 from dotenv import load_dotenv
-from typing import List, Dict, Any, Optional
-import json
+from typing import List, Dict, Any, Optional, Tuple
+import orjson
 from datetime import datetime
-import hashlib
-import base64
-import numpy as np
-from scipy import spatial
-import cv2
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+from contextlib import nullcontext
 import aiohttp
+import ahocorasick
+import xxhash
 
 # Load environment variables
 load_dotenv()
@@ -50,10 +51,32 @@ processor_blip = None
 model_blip = None
 processor_blip2 = None
 model_blip2 = None
+blip_prompt_ids = {}
 maintenance_classifier = None
 damage_detector = None
 safety_assessor = None
 cost_estimator = None
+# Inference device and weight precision (half precision halves weight traffic on GPU)
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+# Opt-in bfloat16 on CPU; only worth it on hosts with AVX-512 BF16 / AMX
+BLIP_CPU_BF16 = os.getenv("BLIP_CPU_BF16", "0") == "1"
+if DEVICE == "cuda":
+    # BF16 keeps FP32's exponent range, so BLIP-2's OPT decoder cannot overflow the way it can in
+    # FP16; it runs at the same speed on GPUs that support it (Ampere and newer)
+    MODEL_DTYPE = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+else:
+    MODEL_DTYPE = torch.bfloat16 if BLIP_CPU_BF16 else torch.float32
+# Optional weight quantization: "none", "int8" or "nf4" (bitsandbytes on GPU);
+# on CPU "int8" applies dynamic int8 quantization to the Linear layers
+BLIP_QUANT = os.getenv("BLIP_QUANT", "none").lower()
+# Opt-in TorchInductor compilation of the BLIP forward passes
+BLIP_COMPILE = os.getenv("BLIP_COMPILE", "0") == "1"
+# Opt-in TorchScript trace of the BLIP vision encoder for CPU deployments
+BLIP_TORCHSCRIPT = os.getenv("BLIP_TORCHSCRIPT", "0") == "1"
+# Intra-op threads for CPU inference; half the cores leaves room for the event loop and image pool
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", max(1, (os.cpu_count() or 1) // 2)))
+# Inter-op pool size; generate runs one op graph at a time, so extra pools only contend for cores
+TORCH_INTEROP_THREADS = int(os.getenv("TORCH_INTEROP_THREADS", 1))
 HF_TOKEN = os.getenv("HF_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
@@ -63,6 +86,378 @@ BLIP2_URL = "https://api-inference.huggingface.co/models/Salesforce/blip2-opt-2.
 LLAMA_URL = "https://api-inference.huggingface.co/models/meta-llama/Llama-2-7b-chat-hf"
 MAINTENANCE_CLASSIFIER_URL = "https://api-inference.huggingface.co/models/course5ai/maintenance-classifier"
 
+# Retry policy for the HF/OpenAI calls: rate limits and gateway errors (524 is Cloudflare's proxy
+# timeout) plus dropped or timed-out connections, with capped, jittered backoff
+AI_RETRY_STATUSES = (429, 502, 503, 504, 524)
+AI_RETRY_ERRORS = (aiohttp.ClientConnectorError, aiohttp.ServerDisconnectedError, aiohttp.ServerTimeoutError)
+AI_MAX_RETRIES = 2
+AI_RETRY_BACKOFF = 0.2
+AI_RETRY_BACKOFF_CAP = 2.0
+
+# Longest HF "model is loading" estimate (seconds) worth waiting out; longer cold starts exceed the
+# callers' time budgets, so those give up straight away and leave the request to the fallbacks
+HF_MAX_LOADING_WAIT = float(os.getenv("HF_MAX_LOADING_WAIT", 8))
+
+# Circuit breaker for the HF/OpenAI calls: open after this many consecutive failures, then
+# let a single probe through every reset interval (seconds) until one succeeds
+AI_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AI_CIRCUIT_FAILURE_THRESHOLD", 5))
+AI_CIRCUIT_RESET_TIMEOUT = float(os.getenv("AI_CIRCUIT_RESET_TIMEOUT", 30))
+# Auth errors no retry will fix (bad or expired token) count as failures too. Rate limits and
+# not-found are neutral: one breaker covers every model on a provider, and a 404 only means that
+# one model was removed or is not served.
+AI_CIRCUIT_FAILURE_STATUSES = (401, 403)
+AI_CIRCUIT_NEUTRAL_STATUSES = (404, 429)
+
+# Overall time budget (seconds) for the raced AI expansion providers before falling back to rules
+AI_EXPANSION_TIMEOUT = float(os.getenv("AI_EXPANSION_TIMEOUT", 10))
+
+# Overall time budget (seconds) for the raced translation providers before the rule-based fallback
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", 15))
+
+# Overall time budget (seconds) for the raced summarization / urgency providers before the rule-based fallback
+AI_ANALYSIS_TIMEOUT = float(os.getenv("AI_ANALYSIS_TIMEOUT", 10))
+
+# Deterministic beam search for BLIP; sampling with beams was the most expensive configuration.
+# Decoder cost scales with the beam count, and captions here are short, so 2 beams is the default.
+BLIP_GENERATION_KWARGS = {
+    "num_beams": int(os.getenv("BLIP_NUM_BEAMS", 2)),
+    "do_sample": False,
+    "max_new_tokens": 60,
+    "no_repeat_ngram_size": 3,
+    "early_stopping": True,
+    "use_cache": True
+}
+
+# Read size when hashing spooled uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Largest accepted image upload, and largest request body (checked from Content-Length before parsing)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", 50 * 1024 * 1024))
+
+# Largest image handed to the BLIP processors (aspect ratio preserved)
+CAPTION_IMAGE_MAX_SIZE = (512, 512)
+
+# BLIP prompts used for local captioning ("a photo of" runs unconditional)
+BLIP_CAPTION_PROMPTS = [
+    "maintenance issue damage repair",
+    "property inspection problem",
+    "a photo of",
+    "what is wrong with this"
+]
+BLIP2_CAPTION_PROMPT = "Question: What maintenance issues can you see? Answer:"
+
+# Thread pool for PIL decode/enhance work (Pillow releases the GIL while decoding)
+image_pool = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="image")
+
+# BLIP generate calls get their own pool so captioning never queues behind (or starves) PIL work;
+# one worker per GPU avoids contending for the device, and batching keeps it busy
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 1))
+inference_pool = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="blip")
+
+# Worker processes for building Tagalog reports off the event loop and outside the GIL
+# (0 builds them inline). Created in lifespan with spawn, since forking a process that
+# already holds loaded models and CUDA state is unsafe.
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 0))
+report_pool: Optional[ProcessPoolExecutor] = None
+
+# Shared HTTP session so outbound AI calls reuse pooled keep-alive connections
+http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared HTTP session, creating it on first use"""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            # Keep idle connections to the AI providers warm between requests and cache their DNS;
+            # the per-host cap stops one slow provider from taking every pooled connection
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=60, ttl_dns_cache=300),
+            # A short connect timeout fails fast on unreachable hosts; the retries cover transient drops
+            timeout=aiohttp.ClientTimeout(total=30, connect=5)
+        )
+    return http_session
+
+
+async def close_http_session():
+    """Close the shared HTTP session on shutdown"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+    http_session = None
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker so outages fail fast instead of waiting out every timeout"""
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = "closed"
+    
+    def is_open(self) -> bool:
+        """True while calls should be skipped; lets one half-open probe through per reset interval"""
+        if self.state == "closed":
+            return False
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            return True
+        # Restarting the clock keeps other callers out, and allows a new probe if this one is cancelled
+        self.state = "half-open"
+        self.opened_at = now
+        logger.warning(f"{self.name} circuit half-open, probing")
+        return False
+    
+    def record_success(self):
+        if self.state != "closed":
+            logger.warning(f"{self.name} circuit closed")
+        self.state = "closed"
+        self.failures = 0
+    
+    def record_status(self, status: int):
+        """Record a non-200 answer: server and auth errors fail, rate limits and not-found count as neither"""
+        if status >= 500 or status in AI_CIRCUIT_FAILURE_STATUSES:
+            self.record_failure()
+        elif status not in AI_CIRCUIT_NEUTRAL_STATUSES:
+            # Request validation errors (400, 413, 422) mean the provider itself is up
+            self.record_success()
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            logger.warning(f"{self.name} circuit open after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+hf_breaker = CircuitBreaker("Hugging Face", AI_CIRCUIT_FAILURE_THRESHOLD, AI_CIRCUIT_RESET_TIMEOUT)
+openai_breaker = CircuitBreaker("OpenAI", AI_CIRCUIT_FAILURE_THRESHOLD, AI_CIRCUIT_RESET_TIMEOUT)
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt + 1; half of it is random so concurrent retries spread out"""
+    delay = min(AI_RETRY_BACKOFF_CAP, AI_RETRY_BACKOFF * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+async def hf_loading_time(response: aiohttp.ClientResponse) -> Optional[float]:
+    """estimated_time (seconds) from an HF "model is loading" 503 body, None for any other 503"""
+    try:
+        body = await response.json(content_type=None)
+    except ValueError:
+        return None
+    estimated_time = body.get("estimated_time") if isinstance(body, dict) else None
+    return float(estimated_time) if isinstance(estimated_time, (int, float)) else None
+
+
+async def post_huggingface(url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> Optional[Any]:
+    """POST to the Hugging Face inference API on the shared session, retrying gateway errors and dropped connections
+    
+    Short model cold starts are waited out using HF's estimated_time; longer ones give up immediately.
+    
+    Returns the decoded JSON body, or None when the endpoint does not answer with 200
+    (or without calling it while the circuit is open).
+    """
+    if hf_breaker.is_open():
+        return None
+    
+    session = get_http_session()
+    headers = {"Authorization": f"Bearer {HF_TOKEN}", **(headers or {})}
+    
+    try:
+        for attempt in range(AI_MAX_RETRIES + 1):
+            delay = retry_delay(attempt)
+            try:
+                async with session.post(url, headers=headers, **kwargs) as response:
+                    if response.status == 200:
+                        hf_breaker.record_success()
+                        return await response.json()
+                    loading_time = await hf_loading_time(response) if response.status == 503 else None
+                    if loading_time is not None:
+                        # A cold-loading model says nothing about HF's health, so the breaker is left alone
+                        if loading_time > HF_MAX_LOADING_WAIT or attempt == AI_MAX_RETRIES:
+                            return None
+                        delay = loading_time
+                    elif response.status not in AI_RETRY_STATUSES or attempt == AI_MAX_RETRIES:
+                        hf_breaker.record_status(response.status)
+                        return None
+            except AI_RETRY_ERRORS:
+                if attempt == AI_MAX_RETRIES:
+                    raise
+            await asyncio.sleep(delay)
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        hf_breaker.record_failure()
+        raise
+
+
+async def post_openai(payload: Dict[str, Any]) -> Optional[str]:
+    """POST a chat completion to OpenAI on the shared session, retrying rate limits and dropped connections
+    
+    Returns the stripped message content, or None when the API does not answer with 200
+    (or without calling it while the circuit is open).
+    """
+    if openai_breaker.is_open():
+        return None
+    
+    headers = {
+        "Authorization": f"Bearer {OPENAI_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    
+    session = get_http_session()
+    
+    try:
+        for attempt in range(AI_MAX_RETRIES + 1):
+            try:
+                async with session.post(
+                    "https://api.openai.com/v1/chat/completions",
+                    headers=headers,
+                    json=payload
+                ) as response:
+                    if response.status == 200:
+                        openai_breaker.record_success()
+                        result = await response.json()
+                        return result['choices'][0]['message']['content'].strip()
+                    if response.status not in AI_RETRY_STATUSES or attempt == AI_MAX_RETRIES:
+                        openai_breaker.record_status(response.status)
+                        return None
+            except AI_RETRY_ERRORS:
+                if attempt == AI_MAX_RETRIES:
+                    raise
+            await asyncio.sleep(retry_delay(attempt))
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        openai_breaker.record_failure()
+        raise
+
+
+class LRUCache:
+    """Small in-process LRU cache (only touched from the event loop thread)"""
+    
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+    
+    def get(self, key, default=None):
+        try:
+            self.data.move_to_end(key)
+        except KeyError:
+            return default
+        return self.data[key]
+    
+    def set(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+
+def content_hash(content) -> bytes:
+    """Stable cache key for image bytes or text (128-bit XXH3; keys only, not integrity)"""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return xxhash.xxh3_128_digest(content)
+
+
+def hash_upload(fileobj) -> bytes:
+    """content_hash of an upload's spooled file, read in chunks instead of one bytes copy (rewinds the file)"""
+    digest = xxhash.xxh3_128()
+    size = 0
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(UPLOAD_CHUNK_SIZE), b""):
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Image is too large")
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.digest()
+
+
+def build_keyword_automaton(groups: Dict[str, Any]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton mapping each keyword to the categories that list it"""
+    categories_by_keyword = {}
+    for category, keywords in groups.items():
+        for keyword in keywords:
+            categories_by_keyword.setdefault(keyword, []).append(category)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, categories in categories_by_keyword.items():
+        automaton.add_word(keyword, (keyword, tuple(categories)))
+    automaton.make_automaton()
+    return automaton
+
+
+# Re-submitted photos and descriptions skip the model / remote API entirely
+# (caption, shorter side of the upload in pixels), so a cache hit can still enforce an endpoint's minimum size
+caption_cache = LRUCache(maxsize=4096)
+# Provider urgencies and summaries only, like translations, so a rule-based fallback is retried next time
+urgency_cache = LRUCache(maxsize=2048)
+summary_cache = LRUCache(maxsize=2048)
+# Context analyses by caption / request text; the same caption recurs across uploads and endpoints
+analysis_cache = LRUCache(maxsize=1024)
+# Provider translations only; rule-based fallbacks are cheap and should retry the providers next time
+translation_cache = LRUCache(maxsize=2048)
+# Urgency classifications currently running, so identical concurrent requests share one AI call
+urgency_inflight: Dict[bytes, asyncio.Task] = {}
+summary_inflight: Dict[bytes, asyncio.Task] = {}
+
+
+# Closing sentence of the detailed issue per severity level
+SEVERITY_CONTEXT_TAGALOG = {
+    "mataas": "Nangangailangan ng AGARANG atensyon dahil sa panganib na dulot",
+    "katamtaman": "Kailangan ng pansin sa lalong madaling panahon",
+    "mababa": "Maaring ayusin sa susunod na schedule ng maintenance"
+}
+
+# Repair cost range (PHP) per severity level
+SEVERITY_COST_RANGES = {
+    "mataas": {"min": 5000, "max": 50000, "currency": "PHP"},
+    "katamtaman": {"min": 1000, "max": 10000, "currency": "PHP"},
+    "mababa": {"min": 200, "max": 2000, "currency": "PHP"}
+}
+
+# Cost multiplier per affected component (others leave the estimate unchanged)
+COMPONENT_COST_MULTIPLIERS = {
+    'elektrikal': 1.5,
+    'plumbing': 1.2,
+    'estruktural': 2.0,
+    'kisame': 1.3,
+    'sahig': 1.1
+}
+
+# Components that trigger the electrician / plumber recommendations
+ELECTRICAL_RECOMMENDATION_COMPONENTS = frozenset(['kawad', 'elektrikal', 'saksakan'])
+PLUMBING_RECOMMENDATION_COMPONENTS = frozenset(['tubo', 'tubig', 'tagas'])
+
+# Components that add each group of materials to the required list
+PLUMBING_MATERIAL_COMPONENTS = frozenset(['tubo', 'plumbing'])
+ELECTRICAL_MATERIAL_COMPONENTS = frozenset(['kawad', 'elektrikal'])
+SURFACE_MATERIAL_COMPONENTS = frozenset(['pader', 'kisame'])
+
+# Repair time estimate per priority level
+REPAIR_TIME_TAGALOG = {
+    "mataas": "2-4 na oras (agarang pag-aayos)",
+    "katamtaman": "1-2 araw (sa loob ng linggo)",
+    "mababa": "1-2 linggo (sa susunod na schedule)"
+}
+
+# Generic repair steps, the same for every report
+REPAIR_STEPS_TAGALOG = (
+    "1. MAGHANDA NG MGA KASANGKAPAN at materyales",
+    "2. SIGURADUHING LIGTAS ANG AREA bago magsimula",
+    "3. KUNAN NG LARAWAN ang sira para sa dokumentasyon",
+    "4. AYUSIN ANG PANGUNAHING ISYU una",
+    "5. TESTING pagkatapos ng pag-aayos",
+    "6. LINISIN ANG AREA pagkatapos",
+    "7. FINAL INSPECTION bago ituring na tapos"
+)
+
+# Base priority score per severity level (anything else scores 1)
+SEVERITY_PRIORITY_SCORES = {"mataas": 3, "katamtaman": 2}
+
+
 class AdvancedMaintenanceAnalyzer:
     """Advanced analyzer for maintenance content generation"""
     
@@ -98,6 +493,19 @@ class AdvancedMaintenanceAnalyzer:
                 'baha', 'apaw', 'sunog'
             ]
         }
+        # One automaton pass finds every keyword of every category
+        self.keyword_automaton = build_keyword_automaton(self.maintenance_keywords_tagalog)
+        # Reports are pure functions of (description, analysis), so repeats are served from memory
+        self.report_cache = LRUCache(maxsize=1024)
+        
+        # Prompts for the different BLIP analysis aspects, with their own keyword hits precomputed
+        self.blip_context_prompts = [
+            "Maintenance issue: damage repair problem",
+            "Property inspection: structural plumbing electrical",
+            "Safety hazard: risk danger emergency",
+            "Building defect: crack leak break"
+        ]
+        self.blip_prompt_hits = [self.keyword_hits(prompt) for prompt in self.blip_context_prompts]
         
         self.maintenance_templates_tagalog = {
             'high_priority': [
@@ -116,9 +524,26 @@ class AdvancedMaintenanceAnalyzer:
                 "PAG-AYOS: {problems} na nakita sa {components}. Maaring isagawa sa susunod na maintenance."
             ]
         }
+        # Template lookups by f"{severity}_priority" never match these keys (severity levels are
+        # Tagalog), so detailed issues always use the first medium-priority template; bind it once
+        self.format_detailed_issue = self.maintenance_templates_tagalog['medium_priority'][0].format
+
+    def report_key(self, description: str, analysis: Dict) -> bytes:
+        """Cache key of the report for a description and analysis"""
+        serialized = orjson.dumps(analysis, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+        return content_hash(description.encode("utf-8") + b"\0" + serialized)
 
     def generate_maintenance_report_tagalog(self, description: str, analysis: Dict) -> Dict[str, Any]:
-        """Generate comprehensive maintenance report in Tagalog"""
+        """Generate comprehensive maintenance report in Tagalog, cached by content"""
+        key = self.report_key(description, analysis)
+        report = self.report_cache.get(key)
+        if report is None:
+            report = self.build_maintenance_report_tagalog(description, analysis)
+            self.report_cache.set(key, report)
+        return report
+
+    def build_maintenance_report_tagalog(self, description: str, analysis: Dict) -> Dict[str, Any]:
+        """Build the maintenance report for generate_maintenance_report_tagalog"""
         
         # Enhanced analysis with multiple model approaches
         enhanced_analysis = self.enhance_analysis_with_ai(description, analysis)
@@ -148,37 +573,38 @@ class AdvancedMaintenanceAnalyzer:
         # Multi-model analysis
         analysis_results = []
         
+        # Both approaches start from the same keywords, so lowercase and scan the description once
+        description_hits = self.keyword_hits(description)
+        
         # Approach 1: BLIP-based analysis
-        analysis_results.append(self.analyze_with_blip_context(description))
+        analysis_results.append(self.analyze_with_blip_context(description, description_hits))
         
         # Approach 2: Rule-based enhancement
-        analysis_results.append(self.rule_based_enhancement(description))
+        analysis_results.append(self.rule_based_enhancement(description, description_hits))
         
         # Combine all analyses
         combined_analysis = self.combine_analyses(analysis_results, basic_analysis)
         
         return combined_analysis
 
-    def analyze_with_blip_context(self, description: str) -> Dict[str, Any]:
+    def analyze_with_blip_context(self, description: str, description_hits: Optional[Dict[str, dict]] = None) -> Dict[str, Any]:
         """Enhanced analysis using BLIP context understanding"""
         
-        # Use multiple prompts for different aspects
-        prompts = [
-            "Maintenance issue: damage repair problem",
-            "Property inspection: structural plumbing electrical",
-            "Safety hazard: risk danger emergency",
-            "Building defect: crack leak break"
-        ]
+        # Scan the description once; no keyword contains ":", so the hits of each
+        # "{prompt}: {description}" input are the prompt's hits plus the description's
+        if description_hits is None:
+            description_hits = self.keyword_hits(description)
         
         analyses = []
-        for prompt in prompts:
-            try:
-                enhanced_input = f"{prompt}: {description}"
-                # This would typically use the BLIP model with different prompts
-                analysis = self.simulate_blip_analysis(enhanced_input)
-                analyses.append(analysis)
-            except Exception as e:
-                logger.warning(f"BLIP analysis with prompt '{prompt}' failed: {e}")
+        for prompt, prompt_hits in zip(self.blip_context_prompts, self.blip_prompt_hits):
+            hits = {category: {**found, **prompt_hits[category]} for category, found in description_hits.items()}
+            enhanced_input = f"{prompt}: {description}"
+            analyses.append({
+                "components": self.extract_components(enhanced_input, hits),
+                "problems": self.extract_problems(enhanced_input, hits),
+                "severity": self.assess_severity(enhanced_input, hits),
+                "context": f"Analysis of: {enhanced_input}"
+            })
         
         return self.merge_blip_analyses(analyses)
 
@@ -186,10 +612,11 @@ class AdvancedMaintenanceAnalyzer:
         """Simulate enhanced BLIP analysis (replace with actual model calls)"""
         
         # This is a simulation - replace with actual BLIP model calls
+        hits = self.keyword_hits(text)
         return {
-            "components": self.extract_components(text),
-            "problems": self.extract_problems(text),
-            "severity": self.assess_severity(text),
+            "components": self.extract_components(text, hits),
+            "problems": self.extract_problems(text, hits),
+            "severity": self.assess_severity(text, hits),
             "context": f"Analysis of: {text}"
         }
 
@@ -203,49 +630,40 @@ class AdvancedMaintenanceAnalyzer:
             "simple": ""
         }
         
+        # Every version lists the same findings, so join them once ("" when empty)
+        joined = {
+            "components": ", ".join(analysis.get("components", [])),
+            "problems": ", ".join(analysis.get("problems", [])),
+            "locations": ", ".join(analysis.get("locations", []))
+        }
+        
         # Primary issue (most detailed)
-        issues["primary"] = self.create_detailed_issue_tagalog(description, analysis)
+        issues["primary"] = self.create_detailed_issue_tagalog(description, analysis, joined)
         
         # Alternative versions
-        issues["alternatives"].append(self.create_technical_issue_tagalog(analysis))
-        issues["alternatives"].append(self.create_simple_issue_tagalog(analysis))
-        issues["alternatives"].append(self.create_urgent_issue_tagalog(analysis))
+        issues["alternatives"].append(self.create_technical_issue_tagalog(analysis, joined))
+        issues["alternatives"].append(self.create_simple_issue_tagalog(analysis, joined))
+        issues["alternatives"].append(self.create_urgent_issue_tagalog(analysis, joined))
         
         # Technical version
-        issues["technical"] = self.create_technical_report_tagalog(analysis)
+        issues["technical"] = self.create_technical_report_tagalog(analysis, joined)
         
         # Simple version
-        issues["simple"] = self.create_simple_description_tagalog(analysis)
+        issues["simple"] = self.create_simple_description_tagalog(analysis, joined)
         
         return issues
 
-    def create_detailed_issue_tagalog(self, description: str, analysis: Dict) -> str:
+    def create_detailed_issue_tagalog(self, description: str, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create detailed maintenance issue in Tagalog"""
         
-        components = ", ".join(analysis.get("components", []))
-        problems = ", ".join(analysis.get("problems", []))
-        locations = ", ".join(analysis.get("locations", []))
-        severity = analysis.get("severity_level", "katamtaman")
+        severity_context = SEVERITY_CONTEXT_TAGALOG.get(analysis.get("severity_level", "katamtaman"), "Kailangan ng inspeksyon")
         
-        severity_context = {
-            "mataas": "Nangangailangan ng AGARANG atensyon dahil sa panganib na dulot",
-            "katamtaman": "Kailangan ng pansin sa lalong madaling panahon",
-            "mababa": "Maaring ayusin sa susunod na schedule ng maintenance"
-        }.get(severity, "Kailangan ng inspeksyon")
-        
-        template = self.maintenance_templates_tagalog.get(
-            f"{severity}_priority", 
-            self.maintenance_templates_tagalog['medium_priority']
-        )[0]
-        
-        issue = template.format(
-            problems=problems if problems else "isyu sa pagpapanatili",
-            components=components if components else "bahagi ng property",
-            locations=locations if locations else "naobserbahang area",
+        return self.format_detailed_issue(
+            problems=joined["problems"] or "isyu sa pagpapanatili",
+            components=joined["components"] or "bahagi ng property",
+            locations=joined["locations"] or "naobserbahang area",
             severity_context=severity_context
         )
-        
-        return issue
 
     def generate_recommendations_tagalog(self, analysis: Dict) -> List[str]:
         """Generate maintenance recommendations in Tagalog"""
@@ -261,15 +679,15 @@ class AdvancedMaintenanceAnalyzer:
             ])
         
         # Component-specific recommendations
-        components = analysis.get("components", [])
-        if any(comp in ['kawad', 'elektrikal', 'saksakan'] for comp in components):
+        components = frozenset(analysis.get("components", []))
+        if not components.isdisjoint(ELECTRICAL_RECOMMENDATION_COMPONENTS):
             recommendations.extend([
                 "⚡ KONSULTA SA LICENSED ELECTRICIAN: Para sa electrical issues",
                 "🔌 IWASAN ANG PAGGAMIT: Hanggang ma-inspeksyonan",
                 "💡 PATAYIN ANG POWER: Sa affected area"
             ])
         
-        if any(comp in ['tubo', 'tubig', 'tagas'] for comp in components):
+        if not components.isdisjoint(PLUMBING_RECOMMENDATION_COMPONENTS):
             recommendations.extend([
                 "💧 ISARA ANG MAIN WATER VALVE: Kung may malaking tagas",
                 "🛠️ TAWAGAN ANG PLUMBER: Para sa plumbing issues",
@@ -291,33 +709,19 @@ class AdvancedMaintenanceAnalyzer:
         severity = analysis.get("severity_level", "katamtaman")
         components = analysis.get("components", [])
         
-        cost_ranges = {
-            "mataas": {"min": 5000, "max": 50000, "currency": "PHP"},
-            "katamtaman": {"min": 1000, "max": 10000, "currency": "PHP"},
-            "mababa": {"min": 200, "max": 2000, "currency": "PHP"}
-        }
-        
-        base_cost = cost_ranges.get(severity, cost_ranges["katamtaman"])
+        base_cost = SEVERITY_COST_RANGES.get(severity, SEVERITY_COST_RANGES["katamtaman"])
         
         # Adjust based on components
-        component_multipliers = {
-            'elektrikal': 1.5,
-            'plumbing': 1.2,
-            'estruktural': 2.0,
-            'kisame': 1.3,
-            'sahig': 1.1
-        }
-        
-        multiplier = 1.0
-        for comp in components:
-            multiplier *= component_multipliers.get(comp, 1.0)
+        multiplier = math.prod(
+            COMPONENT_COST_MULTIPLIERS[comp] for comp in components if comp in COMPONENT_COST_MULTIPLIERS
+        )
         
         estimated_min = base_cost["min"] * multiplier
         estimated_max = base_cost["max"] * multiplier
         
         return {
             "pagtataya": f"₱{estimated_min:,.0f} - ₱{estimated_max:,.0f}",
-            "palihan": f"{base_cost['min'] * multiplier:,.0f} - {base_cost['max'] * multiplier:,.0f} PHP",
+            "palihan": f"{estimated_min:,.0f} - {estimated_max:,.0f} PHP",
             "mga_salik": f"Batay sa severity ({severity}) at mga components ({len(components)})",
             "paalala": "Ang aktwal na gastos ay maaaring mag-iba batay sa assessment ng technician"
         }
@@ -326,15 +730,15 @@ class AdvancedMaintenanceAnalyzer:
         """List required materials in Tagalog"""
         
         materials = []
-        components = analysis.get("components", [])
+        components = frozenset(analysis.get("components", []))
         
-        if any(comp in ['tubo', 'plumbing'] for comp in components):
+        if not components.isdisjoint(PLUMBING_MATERIAL_COMPONENTS):
             materials.extend(["PVC pipes", "pipe fittings", "plumber's tape", "sealant"])
         
-        if any(comp in ['kawad', 'elektrikal'] for comp in components):
+        if not components.isdisjoint(ELECTRICAL_MATERIAL_COMPONENTS):
             materials.extend(["electrical wires", "outlets", "circuit breakers", "conduit"])
         
-        if any(comp in ['pader', 'kisame'] for comp in components):
+        if not components.isdisjoint(SURFACE_MATERIAL_COMPONENTS):
             materials.extend(["drywall", "joint compound", "paint", "primer"])
         
         # Translate to Tagalog
@@ -348,9 +752,8 @@ class AdvancedMaintenanceAnalyzer:
         """Generate safety warnings in Tagalog"""
         
         warnings = []
-        severity = analysis.get("severity_level", "katamtaman")
         
-        if severity == "mataas":
+        if analysis.get("severity_level") == "mataas":
             warnings.extend([
                 "⚠️ HINDI LIGTAS ANG AREA - Bawal pumasok",
                 "🚨 AGARANG EBAKUASYON kung may panganib",
@@ -368,48 +771,35 @@ class AdvancedMaintenanceAnalyzer:
     def repair_steps_tagalog(self, analysis: Dict) -> List[str]:
         """Generate repair steps in Tagalog"""
         
-        steps = [
-            "1. MAGHANDA NG MGA KASANGKAPAN at materyales",
-            "2. SIGURADUHING LIGTAS ANG AREA bago magsimula",
-            "3. KUNAN NG LARAWAN ang sira para sa dokumentasyon",
-            "4. AYUSIN ANG PANGUNAHING ISYU una",
-            "5. TESTING pagkatapos ng pag-aayos",
-            "6. LINISIN ANG AREA pagkatapos",
-            "7. FINAL INSPECTION bago ituring na tapos"
-        ]
-        
-        return steps
+        return list(REPAIR_STEPS_TAGALOG)
 
     # Helper methods
-    def extract_components(self, text: str) -> List[str]:
+    def keyword_hits(self, text: str) -> Dict[str, dict]:
+        """Keywords found in text, per category, in order of first occurrence"""
+        hits = {category: {} for category in self.maintenance_keywords_tagalog}
+        for _, (keyword, categories) in self.keyword_automaton.iter(text.lower()):
+            for category in categories:
+                hits[category].setdefault(keyword)
+        return hits
+
+    def extract_components(self, text: str, hits: Optional[Dict[str, dict]] = None) -> List[str]:
         """Extract components from text"""
-        components = []
-        text_lower = text.lower()
-        
-        for category, keywords in self.maintenance_keywords_tagalog.items():
-            if category in ['structural', 'plumbing', 'electrical']:
-                for keyword in keywords:
-                    if keyword in text_lower:
-                        components.append(keyword)
-        
-        return list(set(components))
+        if hits is None:
+            hits = self.keyword_hits(text)
+        return list(dict.fromkeys(chain(hits['structural'], hits['plumbing'], hits['electrical'])))
 
-    def extract_problems(self, text: str) -> List[str]:
+    def extract_problems(self, text: str, hits: Optional[Dict[str, dict]] = None) -> List[str]:
         """Extract problems from text"""
-        problems = []
-        text_lower = text.lower()
-        
-        for keyword in self.maintenance_keywords_tagalog['problems']:
-            if keyword in text_lower:
-                problems.append(keyword)
-        
-        return list(set(problems))
+        if hits is None:
+            hits = self.keyword_hits(text)
+        return list(hits['problems'])
 
-    def assess_severity(self, text: str) -> str:
+    def assess_severity(self, text: str, hits: Optional[Dict[str, dict]] = None) -> str:
         """Assess severity level"""
-        text_lower = text.lower()
+        if hits is None:
+            hits = self.keyword_hits(text)
         
-        high_severity_words = sum(1 for word in self.maintenance_keywords_tagalog['severity'] if word in text_lower)
+        high_severity_words = len(hits['severity'])
         
         if high_severity_words >= 2:
             return "mataas"
@@ -418,12 +808,14 @@ class AdvancedMaintenanceAnalyzer:
         else:
             return "mababa"
 
-    def rule_based_enhancement(self, description: str) -> Dict[str, Any]:
+    def rule_based_enhancement(self, description: str, hits: Optional[Dict[str, dict]] = None) -> Dict[str, Any]:
         """Rule-based analysis enhancement"""
+        if hits is None:
+            hits = self.keyword_hits(description)
         return {
-            "components": self.extract_components(description),
-            "problems": self.extract_problems(description),
-            "severity_level": self.assess_severity(description),
+            "components": self.extract_components(description, hits),
+            "problems": self.extract_problems(description, hits),
+            "severity_level": self.assess_severity(description, hits),
             "confidence": "mataas" if len(description.split()) > 10 else "katamtaman"
         }
 
@@ -447,16 +839,8 @@ class AdvancedMaintenanceAnalyzer:
         components_count = len(analysis.get("components", []))
         problems_count = len(analysis.get("problems", []))
         
-        priority_score = 0
-        if severity == "mataas":
-            priority_score += 3
-        elif severity == "katamtaman":
-            priority_score += 2
-        else:
-            priority_score += 1
-            
-        priority_score += min(components_count, 3) * 0.5
-        priority_score += min(problems_count, 3) * 0.5
+        priority_score = SEVERITY_PRIORITY_SCORES.get(severity, 1)
+        priority_score += (min(components_count, 3) + min(problems_count, 3)) * 0.5
         
         if priority_score >= 4:
             return "mataas"
@@ -467,44 +851,27 @@ class AdvancedMaintenanceAnalyzer:
 
     def estimate_repair_time(self, analysis: Dict) -> str:
         """Estimate repair time"""
-        priority = analysis.get("priority_level", "mababa")
-        
-        time_estimates = {
-            "mataas": "2-4 na oras (agarang pag-aayos)",
-            "katamtaman": "1-2 araw (sa loob ng linggo)",
-            "mababa": "1-2 linggo (sa susunod na schedule)"
-        }
-        
-        return time_estimates.get(priority, "1-2 araw")
+        return REPAIR_TIME_TAGALOG.get(analysis.get("priority_level", "mababa"), "1-2 araw")
 
-    def create_technical_issue_tagalog(self, analysis: Dict) -> str:
+    def create_technical_issue_tagalog(self, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create technical version of maintenance issue"""
-        components = ", ".join(analysis.get("components", []))
-        problems = ", ".join(analysis.get("problems", []))
-        
-        return f"TECHNICAL REPORT: {problems if problems else 'isyu'} sa {components if components else 'property'}. Severity: {analysis.get('severity_level', 'katamtaman')}. Priority: {analysis.get('priority_level', 'katamtaman')}"
+        return f"TECHNICAL REPORT: {joined['problems'] or 'isyu'} sa {joined['components'] or 'property'}. Severity: {analysis.get('severity_level', 'katamtaman')}. Priority: {analysis.get('priority_level', 'katamtaman')}"
 
-    def create_simple_issue_tagalog(self, analysis: Dict) -> str:
+    def create_simple_issue_tagalog(self, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create simple version of maintenance issue"""
-        problems = analysis.get('problems', [])
-        components = analysis.get('components', [])
-        return f"Kailangan ayusin: {', '.join(problems) if problems else 'isyu'} sa {', '.join(components) if components else 'property'}"
+        return f"Kailangan ayusin: {joined['problems'] or 'isyu'} sa {joined['components'] or 'property'}"
 
-    def create_urgent_issue_tagalog(self, analysis: Dict) -> str:
+    def create_urgent_issue_tagalog(self, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create urgent version of maintenance issue"""
-        problems = analysis.get('problems', [])
-        return f"AGARANG PAG-AYOS: {', '.join(problems) if problems else 'isyu sa pagpapanatili'} - {analysis.get('severity_level', 'katamtaman')} na panganib"
+        return f"AGARANG PAG-AYOS: {joined['problems'] or 'isyu sa pagpapanatili'} - {analysis.get('severity_level', 'katamtaman')} na panganib"
 
-    def create_technical_report_tagalog(self, analysis: Dict) -> str:
+    def create_technical_report_tagalog(self, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create comprehensive technical report"""
-        components = analysis.get('components', [])
-        problems = analysis.get('problems', [])
-        return f"MAINTENANCE TECHNICAL REPORT: Components affected: {', '.join(components) if components else 'hindi tukoy'}. Issues: {', '.join(problems) if problems else 'isyu sa pagpapanatili'}. Severity: {analysis.get('severity_level')}. Estimated repair time: {analysis.get('estimated_time')}"
+        return f"MAINTENANCE TECHNICAL REPORT: Components affected: {joined['components'] or 'hindi tukoy'}. Issues: {joined['problems'] or 'isyu sa pagpapanatili'}. Severity: {analysis.get('severity_level')}. Estimated repair time: {analysis.get('estimated_time')}"
 
-    def create_simple_description_tagalog(self, analysis: Dict) -> str:
+    def create_simple_description_tagalog(self, analysis: Dict, joined: Dict[str, str]) -> str:
         """Create simple description"""
-        problems = analysis.get('problems', [])
-        return f"May sira na kailangang ayusin: {', '.join(problems) if problems else 'isyu sa pagpapanatili'}"
+        return f"May sira na kailangang ayusin: {joined['problems'] or 'isyu sa pagpapanatili'}"
 
     def merge_blip_analyses(self, analyses: List[Dict]) -> Dict[str, Any]:
         """Merge multiple BLIP analyses"""
@@ -523,8 +890,8 @@ class AdvancedMaintenanceAnalyzer:
             merged["problems"].extend(analysis.get("problems", []))
         
         # Deduplicate
-        merged["components"] = list(set(merged["components"]))
-        merged["problems"] = list(set(merged["problems"]))
+        merged["components"] = list(dict.fromkeys(merged["components"]))
+        merged["problems"] = list(dict.fromkeys(merged["problems"]))
         
         # Determine overall severity
         severities = [analysis.get("severity", "mababa") for analysis in analyses]
@@ -540,8 +907,51 @@ class AdvancedMaintenanceAnalyzer:
 # Initialize the advanced analyzer
 advanced_analyzer = AdvancedMaintenanceAnalyzer()
 
+
+def build_report_in_worker(description: str, analysis: Dict) -> Dict[str, Any]:
+    """Build a maintenance report with the worker process's own analyzer"""
+    return advanced_analyzer.build_maintenance_report_tagalog(description, analysis)
+
+
+async def generate_maintenance_report(description: str, analysis: Dict) -> Dict[str, Any]:
+    """Cached maintenance report; misses are built in report_pool when it is enabled"""
+    if report_pool is None:
+        return advanced_analyzer.generate_maintenance_report_tagalog(description, analysis)
+    
+    key = advanced_analyzer.report_key(description, analysis)
+    report = advanced_analyzer.report_cache.get(key)
+    if report is None:
+        report = await asyncio.get_running_loop().run_in_executor(
+            report_pool, build_report_in_worker, description, analysis
+        )
+        advanced_analyzer.report_cache.set(key, report)
+    return report
+
 # AI EXPANSION FUNCTIONS
 
+async def first_successful(coros: list, timeout: float):
+    """Run coroutines concurrently and return the first truthy result (None if none within timeout)"""
+    if not coros:
+        return None
+    
+    loop = asyncio.get_running_loop()
+    pending = {asyncio.ensure_future(coro) for coro in coros}
+    deadline = loop.time() + timeout
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    return task.result()
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 async def expand_description_with_ai(basic_description: str, image_analysis: dict) -> str:
     """
     Expand basic description into maintenance-worthy context using AI
@@ -567,17 +977,19 @@ Write sentences that:
 
 Description:"""
 
-        # Try multiple AI services for expansion
-        expanded = None
+        # Race the configured AI services; the first useful expansion wins
+        providers = []
         used_rule_based = False
         
         # Option 1: Use Hugging Face LLaMA or similar
         if HF_TOKEN:
-            expanded = await expand_with_huggingface(expansion_prompt)
+            providers.append(expand_with_huggingface(expansion_prompt))
         
         # Option 2: Use OpenAI (if available)
-        if not expanded and OPENAI_API_KEY:
-            expanded = await expand_with_openai(expansion_prompt)
+        if OPENAI_API_KEY:
+            providers.append(expand_with_openai(expansion_prompt))
+        
+        expanded = await first_successful(providers, AI_EXPANSION_TIMEOUT)
         
         # Option 3: Rule-based enhancement as fallback
         if not expanded:
@@ -594,34 +1006,118 @@ Description:"""
         return rule_based_expansion(basic_description, image_analysis)
 
 
-async def expand_with_huggingface(prompt: str) -> str:
-    """Expand description using Hugging Face API"""
-    try:
-        headers = {"Authorization": f"Bearer {HF_TOKEN}"}
-        
-        # Use a smaller, faster model for text generation
-        api_url = "https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.1"
-        
+class HFPromptBatcher:
+    """Micro-batcher that coalesces concurrent prompts for one HF text-generation model into one call"""
+    
+    def __init__(self, url: str, parameters: Dict[str, Any], max_batch: int = 8, max_latency_ms: float = 20):
+        self.url = url
+        self.parameters = parameters
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        # Batch being collected by the runner, so stop() can answer it
+        self.batch: list = []
+        # Strong references to in-flight dispatches (the event loop only keeps weak ones)
+        self.dispatches = set()
+    
+    def start(self):
+        """Start the background runner on the running event loop"""
+        if self.task is None:
+            self.queue = asyncio.Queue()
+            self.task = asyncio.create_task(self.runner())
+    
+    async def stop(self):
+        """Cancel the background runner and answer every prompt it would have sent with None"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            
+            leftover = self.batch
+            while not self.queue.empty():
+                leftover.append(self.queue.get_nowait())
+            for _, future in leftover:
+                if not future.done():
+                    future.set_result(None)
+            self.batch = []
+    
+    async def submit(self, prompt: str) -> Optional[str]:
+        """Queue a prompt and wait for its generated text (None if the model gave nothing)"""
+        if self.task is None or self.task.done():
+            return (await self.generate([prompt]))[0]
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((prompt, future))
+        return await future
+    
+    async def generate(self, prompts: List[str]) -> List[Optional[str]]:
+        """Send all prompts in a single inference request"""
         payload = {
-            "inputs": prompt,
-            "parameters": {
-                "max_new_tokens": 150,
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "do_sample": True,
-                "return_full_text": False
-            }
+            "inputs": prompts[0] if len(prompts) == 1 else prompts,
+            "parameters": self.parameters
         }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        generated_text = result[0].get('generated_text', '')
-                        # Extract just the description part
-                        return clean_generated_text(generated_text)
-                    
+        try:
+            result = await post_huggingface(self.url, json=payload)
+        except Exception as e:
+            logger.warning(f"Hugging Face generation for {len(prompts)} prompts failed: {e}")
+            return [None] * len(prompts)
+        
+        if not isinstance(result, list) or len(result) != len(prompts):
+            return [None] * len(prompts)
+        
+        outputs = []
+        for item in result:
+            # Batched inputs come back as one list of generations per prompt
+            if isinstance(item, list):
+                item = item[0] if item else {}
+            outputs.append(item.get('generated_text') if isinstance(item, dict) else None)
+        return outputs
+    
+    async def dispatch(self, batch: list):
+        """Run one batched request and resolve its callers' futures"""
+        outputs = await self.generate([prompt for prompt, _ in batch])
+        for (_, future), output in zip(batch, outputs):
+            if not future.done():
+                future.set_result(output)
+    
+    async def runner(self):
+        """Drain the queue into batches; batches run concurrently so a slow call does not stall the queue"""
+        while True:
+            self.batch = []
+            batch = await collect_batch(self.queue, self.max_batch, self.max_latency, self.batch)
+            self.batch = []
+            dispatch = asyncio.create_task(self.dispatch(batch))
+            self.dispatches.add(dispatch)
+            dispatch.add_done_callback(self.dispatches.discard)
+
+
+expansion_batcher = HFPromptBatcher(
+    # Use a smaller, faster model for text generation
+    "https://api-inference.huggingface.co/models/mistralai/Mistral-7B-Instruct-v0.1",
+    {
+        "max_new_tokens": 150,
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "do_sample": True,
+        "return_full_text": False
+    },
+    max_batch=int(os.getenv("HF_EXPANSION_MAX_BATCH", 8)),
+    max_latency_ms=float(os.getenv("HF_EXPANSION_MAX_LATENCY_MS", 20))
+)
+
+
+async def expand_with_huggingface(prompt: str) -> str:
+    """Expand description using Hugging Face API (batched with concurrent requests)"""
+    try:
+        generated_text = await expansion_batcher.submit(prompt)
+        if generated_text is not None:
+            # Extract just the description part
+            return clean_generated_text(generated_text)
+            
     except Exception as e:
         logger.warning(f"Hugging Face expansion failed: {e}")
         return None
@@ -630,11 +1126,6 @@ async def expand_with_huggingface(prompt: str) -> str:
 async def expand_with_openai(prompt: str) -> str:
     """Expand description using OpenAI API"""
     try:
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": "gpt-3.5-turbo",
             "messages": [
@@ -645,17 +1136,8 @@ async def expand_with_openai(prompt: str) -> str:
             "temperature": 0.7
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result['choices'][0]['message']['content'].strip()
-                    
+        return await post_openai(payload)
+                
     except Exception as e:
         logger.warning(f"OpenAI expansion failed: {e}")
         return None
@@ -686,35 +1168,51 @@ def rule_based_expansion(basic_description: str, analysis: dict) -> str:
     return craft_conversational_description(synthetic_ai_text, fallback_text, analysis)
 
 
+# Caption patterns for enhance_basic_description, in priority order (the first that matches wins)
+BASIC_DESCRIPTION_RULES = [
+    (r'(crack|cracks|cracking)', 'Structural cracking detected requiring repair'),
+    (r'(leak|leaking|water leak)', 'Water leakage issue identified requiring immediate attention'),
+    (r'(stain|stains|discolor|discoloration)', 'Staining and discoloration observed indicating water damage or deterioration'),
+    (r'(damage|damaged|damaging)', 'Property damage requiring professional repair'),
+    (r'(broken|break|breaking)', 'Structural failure detected requiring immediate repair'),
+    (r'(mold|mildew|fungus)', 'Moisture-related biological growth present requiring remediation'),
+    (r'(rust|rusted|corros|corroded)', 'Metal corrosion and deterioration observed requiring treatment'),
+    (r'(hole|holes)', 'Structural breach requiring patching and repair'),
+    (r'(loose|detach|detached)', 'Loose or detached component requiring reattachment'),
+    (r'(peel|peeling)', 'Surface degradation and peeling requiring refinishing'),
+    (r'(old|worn|aged|deteriorate|dilapidate)', 'Deterioration due to age requiring replacement or restoration'),
+    (r'(expose|exposed)', 'Exposed components creating safety hazard requiring cover or repair'),
+    (r'(door|doorknob|knob|handle).*?(broken|old|damage|worn|missing)', 'Door hardware failure requiring replacement'),
+    (r'(broken|damage|old).*?(door|doorknob|knob|handle)', 'Door hardware failure requiring replacement'),
+    (r'(floor|flooring).*?(broken|damage|crack|hole|expose|pipe)', 'Flooring damage with exposed infrastructure requiring immediate repair'),
+    (r'(pipe|plumbing).*?(expose|leak|break|damage)', 'Plumbing system damage requiring immediate attention'),
+    (r'(expose|visible).*?(pipe|plumbing|wire)', 'Exposed infrastructure creating safety concern'),
+    (r'(poor|bad).*?(condition|state)', 'Poor condition requiring maintenance work')
+]
+
+# All rules fused into one pattern. Each rule sits in a lookahead, so a scan tries them in
+# priority order at every position without consuming text, and the lowest rule index seen
+# anywhere is the rule a sequential search would have picked. The rules are lowercase and
+# enhance_basic_description lowercases its input, so matching is case-sensitive.
+BASIC_DESCRIPTION_RE = re.compile(
+    "|".join(f"(?=(?P<rule{index}>{pattern}))" for index, (pattern, _) in enumerate(BASIC_DESCRIPTION_RULES))
+)
+
+
 def enhance_basic_description(description: str) -> str:
     """Enhance basic description with maintenance context"""
     description = description.lower()
     
     # Pattern matching for common scenarios - MORE AGGRESSIVE
-    patterns = {
-        r'(crack|cracks|cracking)': 'Structural cracking detected requiring repair',
-        r'(leak|leaking|water leak)': 'Water leakage issue identified requiring immediate attention',
-        r'(stain|stains|discolor|discoloration)': 'Staining and discoloration observed indicating water damage or deterioration',
-        r'(damage|damaged|damaging)': 'Property damage requiring professional repair',
-        r'(broken|break|breaking)': 'Structural failure detected requiring immediate repair',
-        r'(mold|mildew|fungus)': 'Moisture-related biological growth present requiring remediation',
-        r'(rust|rusted|corros|corroded)': 'Metal corrosion and deterioration observed requiring treatment',
-        r'(hole|holes)': 'Structural breach requiring patching and repair',
-        r'(loose|detach|detached)': 'Loose or detached component requiring reattachment',
-        r'(peel|peeling)': 'Surface degradation and peeling requiring refinishing',
-        r'(old|worn|aged|deteriorate|dilapidate)': 'Deterioration due to age requiring replacement or restoration',
-        r'(expose|exposed)': 'Exposed components creating safety hazard requiring cover or repair',
-        r'(door|doorknob|knob|handle).*?(broken|old|damage|worn|missing)': 'Door hardware failure requiring replacement',
-        r'(broken|damage|old).*?(door|doorknob|knob|handle)': 'Door hardware failure requiring replacement',
-        r'(floor|flooring).*?(broken|damage|crack|hole|expose|pipe)': 'Flooring damage with exposed infrastructure requiring immediate repair',
-        r'(pipe|plumbing).*?(expose|leak|break|damage)': 'Plumbing system damage requiring immediate attention',
-        r'(expose|visible).*?(pipe|plumbing|wire)': 'Exposed infrastructure creating safety concern',
-        r'(poor|bad).*?(condition|state)': 'Poor condition requiring maintenance work'
-    }
-    
-    for pattern, replacement in patterns.items():
-        if re.search(pattern, description, re.IGNORECASE):
-            return replacement
+    best = None
+    for match in BASIC_DESCRIPTION_RE.finditer(description):
+        index = int(match.lastgroup[4:])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    if best is not None:
+        return BASIC_DESCRIPTION_RULES[best][1]
     
     # If nothing matches but description exists, create generic maintenance issue
     if len(description.strip()) > 5:
@@ -722,12 +1220,18 @@ def enhance_basic_description(description: str) -> str:
     
     return "Property condition requiring inspection and maintenance evaluation"
 
+# Boilerplate that text-generation models prepend to their answers
+GENERATED_PREFIX_RE = re.compile(r'^(Description:|Here\'s|Here is|The description is:)\s*', re.IGNORECASE)
+SUMMARY_PREFIX_RE = re.compile(r'^(Summary:|Here\'s a summary:|The summary is:|In summary:)\s*', re.IGNORECASE)
+NEWLINES_RE = re.compile(r'\n+')
+
 
+@lru_cache(maxsize=1024)
 def clean_generated_text(text: str) -> str:
     """Clean up AI-generated text"""
     # Remove common AI artifacts
-    text = re.sub(r'^(Description:|Here\'s|Here is|The description is:)\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\n+', ' ', text)
+    text = GENERATED_PREFIX_RE.sub('', text)
+    text = NEWLINES_RE.sub(' ', text)
     text = text.strip()
     
     # Ensure it ends with punctuation
@@ -739,7 +1243,12 @@ def clean_generated_text(text: str) -> str:
 
 def format_en_list(items: List[str], default: str) -> str:
     """Format English list with natural conjunctions"""
-    filtered = [item for item in items if item]
+    return format_en_items(tuple(item for item in items if item), default)
+
+
+@lru_cache(maxsize=1024)
+def format_en_items(filtered: tuple, default: str) -> str:
+    """format_en_list for already filtered items (memoized; component lists repeat)"""
     if not filtered:
         return default
     if len(filtered) == 1:
@@ -749,6 +1258,7 @@ def format_en_list(items: List[str], default: str) -> str:
     return f"{', '.join(filtered[:-1])}, and {filtered[-1]}"
 
 
+@lru_cache(maxsize=1024)
 def ensure_sentence(text: str) -> str:
     """Ensure text is a properly terminated sentence"""
     text = text.strip()
@@ -759,6 +1269,18 @@ def ensure_sentence(text: str) -> str:
     return text[0].upper() + text[1:]
 
 
+# Fixed sentences of craft_conversational_description, already passed through ensure_sentence
+SEVERITY_SENTENCES_EN = {
+    severity: ensure_sentence(sentence) for severity, sentence in {
+        "mataas": "It already feels urgent and could pose a safety risk if ignored",
+        "katamtaman": "It's starting to worsen, so a prompt inspection would really help",
+        "mababa": "It is still manageable, but I would like to fix it before it spreads"
+    }.items()
+}
+DEFAULT_SEVERITY_SENTENCE_EN = ensure_sentence("It would help to inspect this area so the damage does not spread")
+CALL_TO_ACTION_EN = ensure_sentence("Please help schedule a repair so it does not get worse")
+
+
 def craft_conversational_description(ai_text: str, fallback: str, analysis: Dict[str, Any]) -> str:
     """Blend AI output with analysis to create conversational sentences"""
     components = analysis.get("components", [])
@@ -767,12 +1289,7 @@ def craft_conversational_description(ai_text: str, fallback: str, analysis: Dict
     problem_phrase = format_en_list(problems, "a visible issue")
     
     severity_level = analysis.get("severity_level") or analysis.get("severity") or "katamtaman"
-    severity_sentence_map = {
-        "mataas": "It already feels urgent and could pose a safety risk if ignored",
-        "katamtaman": "It's starting to worsen, so a prompt inspection would really help",
-        "mababa": "It is still manageable, but I would like to fix it before it spreads"
-    }
-    severity_sentence = ensure_sentence(severity_sentence_map.get(severity_level, "It would help to inspect this area so the damage does not spread"))
+    severity_sentence = SEVERITY_SENTENCES_EN.get(severity_level, DEFAULT_SEVERITY_SENTENCE_EN)
     
     observation_sentence = ensure_sentence(f"The photo clearly shows {problem_phrase} affecting {component_phrase}")
     cleaned_ai = clean_generated_text(ai_text) if ai_text else ""
@@ -784,12 +1301,14 @@ def craft_conversational_description(ai_text: str, fallback: str, analysis: Dict
     if not detail_sentence and fallback:
         fallback_sentence = ensure_sentence(fallback)
     
-    call_to_action = ensure_sentence("Please help schedule a repair so it does not get worse")
-    
     sentences = [observation_sentence]
-    for candidate in [detail_sentence, fallback_sentence, severity_sentence, call_to_action]:
-        if candidate and candidate.lower() not in [s.lower() for s in sentences]:
-            sentences.append(candidate)
+    seen = {observation_sentence.lower()}
+    for candidate in (detail_sentence, fallback_sentence, severity_sentence, CALL_TO_ACTION_EN):
+        if candidate:
+            lowered = candidate.lower()
+            if lowered not in seen:
+                sentences.append(candidate)
+                seen.add(lowered)
     
     return " ".join(sentences).strip()
 
@@ -799,22 +1318,24 @@ async def translate_to_tagalog(text: str) -> str:
     Translate English maintenance description to Tagalog
     Uses multiple translation strategies
     """
+    key = content_hash(text)
+    cached = translation_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        # Strategy 1: Hugging Face Translation API
+        # Strategies 1-3 race: Hugging Face (when configured), LibreTranslate and MyMemory (free);
+        # the first non-empty translation wins and the others are cancelled
+        providers = [translate_with_libretranslate(text), translate_with_mymemory(text)]
         if HF_TOKEN:
-            translated = await translate_with_hf_api(text)
-            if translated:
-                return ensure_natural_tagalog(translated)
+            providers.insert(0, translate_with_hf_api(text))
         
-        # Strategy 2: Use LibreTranslate (free service)
-        translated = await translate_with_libretranslate(text)
-        if translated:
-            return ensure_natural_tagalog(translated)
+        translated = await first_successful(providers, TRANSLATION_TIMEOUT)
         
-        # Strategy 3: Use MyMemory Translation API (free)
-        translated = await translate_with_mymemory(text)
         if translated:
-            return ensure_natural_tagalog(translated)
+            result = ensure_natural_tagalog(translated)
+            translation_cache.set(key, result)
+            return result
         
         # Strategy 4: Rule-based translation for common phrases
         translated = rule_based_tagalog_translation(text)
@@ -829,59 +1350,83 @@ async def translate_to_tagalog(text: str) -> str:
         return ensure_natural_tagalog(text)
 
 
-async def translate_with_hf_api(text: str) -> str:
-    """Translate using Hugging Face API"""
+async def translate_with_hf_api(text: str) -> Optional[str]:
+    """Translate using Hugging Face API (None without a translation, so the other providers win the race)"""
     try:
-        headers = {"Authorization": f"Bearer {HF_TOKEN}"}
         api_url = "https://api-inference.huggingface.co/models/Helsinki-NLP/opus-mt-en-tl"
         
         payload = {"inputs": text}
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        return result[0].get('translation_text', text)
-                        
+        result = await post_huggingface(api_url, json=payload)
+        if isinstance(result, list) and len(result) > 0:
+            # Never fall back to the English input: it would win the race and be cached as Tagalog
+            translated = result[0].get('translation_text')
+            if isinstance(translated, str) and translated.strip():
+                return translated
+            return None
+                
     except Exception as e:
         logger.warning(f"HF translation failed: {e}")
         return None
 
 
+# Public LibreTranslate instances
+LIBRETRANSLATE_ENDPOINTS = [
+    "https://libretranslate.com/translate",
+    "https://translate.argosopentech.com/translate",
+    "https://libretranslate.de/translate"
+]
+# Instance that answered last; tried alone first, and cleared when it fails so all are probed again
+libretranslate_endpoint: Optional[str] = None
+
+
+async def post_libretranslate(endpoint: str, payload: dict) -> Optional[tuple]:
+    """(endpoint, translation) from one LibreTranslate instance, or None"""
+    try:
+        async with get_http_session().post(
+            endpoint,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=15
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                translation = result.get('translatedText', '')
+                if translation:
+                    return endpoint, translation
+    except Exception as e:
+        logger.warning(f"LibreTranslate endpoint {endpoint} failed: {e}")
+    return None
+
+
 async def translate_with_libretranslate(text: str) -> str:
     """Translate using LibreTranslate (free service)"""
+    global libretranslate_endpoint
     try:
-        # Try different LibreTranslate instances
-        endpoints = [
-            "https://libretranslate.com/translate",
-            "https://translate.argosopentech.com/translate",
-            "https://libretranslate.de/translate"
-        ]
+        payload = {
+            "q": text,
+            "source": "en",
+            "target": "tl",
+            "format": "text"
+        }
+        
+        # Reuse the instance that worked last time
+        sticky = libretranslate_endpoint
+        if sticky:
+            answer = await post_libretranslate(sticky, payload)
+            if answer:
+                return answer[1]
+            libretranslate_endpoint = None
+        
+        # Otherwise probe the other instances concurrently and stick with the first to answer
+        answer = await first_successful(
+            [post_libretranslate(endpoint, payload) for endpoint in LIBRETRANSLATE_ENDPOINTS if endpoint != sticky],
+            15
+        )
+        if answer:
+            libretranslate_endpoint = answer[0]
+            return answer[1]
         
-        for endpoint in endpoints:
-            try:
-                payload = {
-                    "q": text,
-                    "source": "en",
-                    "target": "tl",
-                    "format": "text"
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        endpoint,
-                        json=payload,
-                        headers={"Content-Type": "application/json"},
-                        timeout=15
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            return result.get('translatedText', '')
-            except Exception as e:
-                logger.warning(f"LibreTranslate endpoint {endpoint} failed: {e}")
-                continue
-                
         return None
     except Exception as e:
         logger.warning(f"LibreTranslate failed: {e}")
@@ -897,170 +1442,219 @@ async def translate_with_mymemory(text: str) -> str:
             "langpair": "en|tl"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=15) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    translation = result.get('responseData', {}).get('translatedText', '')
-                    if translation and translation != text:
-                        return translation
+        async with get_http_session().get(url, params=params, timeout=15) as response:
+            if response.status == 200:
+                result = await response.json()
+                translation = result.get('responseData', {}).get('translatedText', '')
+                if translation and translation != text:
+                    return translation
         return None
     except Exception as e:
         logger.warning(f"MyMemory translation failed: {e}")
         return None
 
 
+# Common maintenance phrases (English -> Natural Tagalog), applied before the word translations
+TAGALOG_PHRASE_REPLACEMENTS = {
+    r'\bmaintenance issue\b': 'problema sa bahay',
+    r'\brequires attention\b': 'kailangan ng atensyon',
+    r'\bneeds repair\b': 'kailangan ayusin',
+    r'\bprofessional assessment\b': 'tingnan ng eksperto',
+    r'\bwater damage\b': 'sira mula sa tubig',
+    r'\bstructural damage\b': 'sira sa istruktura',
+    r'\belectrical problem\b': 'problema sa kuryente',
+    r'\bplumbing issue\b': 'problema sa tubig',
+    r'\bsafety hazard\b': 'delikado',
+    r'\bimmediate action\b': 'kaagad na aksyon',
+    r'\bprompt attention\b': 'agad na atensyon',
+    r'\bproperty maintenance\b': 'pag-aayos ng bahay',
+    r'\bbuilding defect\b': 'depekto ng bahay',
+    r'\bcomponent failure\b': 'nasirang parte',
+    r'\bsurface degradation\b': 'sira sa ibabaw',
+    r'\bmoisture infiltration\b': 'pasok ng tubig',
+    r'\bprofessional repair\b': 'pagkukumpuni ng eksperto'
+}
+
+# Common maintenance terms (English -> Natural Tagalog), matched as whole words
+TAGALOG_WORD_TRANSLATIONS = {
+    # Problems - more natural terms
+    'crack': 'may bitak',
+    'cracking': 'bumibitak',
+    'leak': 'may tagas',
+    'leaking': 'tumatagas',
+    'damage': 'nasira',
+    'damaged': 'sira',
+    'broken': 'basag',
+    'stain': 'mantsa',
+    'staining': 'namimintana',
+    'rust': 'kalawang',
+    'corrosion': 'kinakalawang',
+    'mold': 'amag',
+    'hole': 'butas',
+    'peeling': 'nakakalpak',
+    'deterioration': 'luma na',
+    'failure': 'nasira',
+    'breach': 'sirado',
+    'discoloration': 'kupas',
+    'wear': 'gasgas',
+    
+    # Components - more natural terms
+    'wall': 'pader',
+    'ceiling': 'kisame', 
+    'floor': 'sahig',
+    'pipe': 'tubo',
+    'plumbing': 'tubo ng tubig',
+    'electrical': 'kuryente',
+    'wire': 'kawad',
+    'wiring': 'mga kawad',
+    'outlet': 'saksakan',
+    'toilet': 'kubeta',
+    'sink': 'lababo',
+    'faucet': 'gripo',
+    'structure': 'istruktura',
+    'fixture': 'kagamitan',
+    'system': 'sistema',
+    'component': 'parte',
+    
+    # Severity - more natural expressions
+    'severe': 'malala',
+    'serious': 'seryoso',
+    'major': 'malaki',
+    'significant': 'malaki',
+    'extensive': 'malawak',
+    'notable': 'kapansin-pansin',
+    
+    # Actions - more natural verbs
+    'repair': 'kumpunihin',
+    'fix': 'ayusin',
+    'replace': 'palitan',
+    'inspect': 'tingnan',
+    'inspection': 'pagsusuri',
+    'maintenance': 'pag-aayos',
+    'attention': 'ating pansin',
+    'immediate': 'kaagad',
+    'urgent': 'madalian',
+    'prompt': 'agaran',
+    'scheduled': 'nakatakda',
+    'recommended': 'irerekomenda',
+    'professional': 'eksperto',
+    'assessment': 'pagtasa',
+    
+    # Descriptors - more natural phrasing
+    'requires': 'kailangan',
+    'requiring': 'nangangailangan',
+    'observed': 'napansin',
+    'detected': 'nakita',
+    'identified': 'natukoy',
+    'issue': 'problema',
+    'problem': 'sira',
+    'property': 'bahay',
+    'prevent': 'maiwasan',
+    'further': 'lalong',
+    'water': 'tubig',
+    'infiltration': 'tagas',
+    'biological': 'amag',
+    'growth': 'dami',
+    'present': 'mayroon',
+    'metal': 'bakal',
+    'structural': 'istruktura',
+    'surface': 'ibabaw',
+    'degradation': 'pagsira',
+    'patching': 'pagsasaayos',
+    'reattachment': 'pagkakabit',
+    'loose': 'maluwag',
+    'detached': 'kalas',
+    'moisture-related': 'may kinalaman sa tubig'
+}
+
+# Post-processing for more natural Tagalog
+TAGALOG_NATURAL_IMPROVEMENTS = {
+    r'\bkailangan ng kumpuni\b': 'kailangan kumpunihin',
+    r'\bkailangan ng ayos\b': 'kailangan ayusin',
+    r'\bproblema sa problema\b': 'problema',
+    r'\bsira na sira\b': 'sira',
+    r'\bdelikado na delikado\b': 'delikado',
+    r'\bmadalian na madalian\b': 'madalian',
+    r'\bkaagad na kaagad\b': 'kaagad',
+    r'\bagaran na agaran\b': 'agaran'
+}
+
+# Leftover English words replaced when polishing translated text
+TAGALOG_POLISH_REPLACEMENTS = {
+    r'\bmaintenance\b': 'pagpapanatili',
+    r'\bissue\b': 'problema',
+    r'\bproblem\b': 'suliranin',
+    r'\bcomponent\b': 'bahagi',
+    r'\bsystem\b': 'sistema',
+    r'\bplease\b': 'pakiusap',
+    r'\bmanager\b': 'tagapamahala',
+    r'\bdamage\b': 'sira',
+    r'\brepair\b': 'pag-aayos',
+    r'\bcheck\b': 'suriin',
+    r'\binspect\b': 'siyasatin',
+    r'\bhelp\b': 'tulong',
+    r'\btenant\b': 'nangungupahan',
+    r'\barea\b': 'bahagi',
+    r'\bsevere\b': 'malala',
+    r'\burgent\b': 'agaran',
+    r'\bplease help\b': 'pakiusap tulungan',
+    r'\band\b': 'at'
+}
+
+# The tables above compiled once at import, in application order
+TAGALOG_PHRASE_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), tagalog) for pattern, tagalog in TAGALOG_PHRASE_REPLACEMENTS.items()
+]
+# Word pass tokenizer: keys that are not a single \w+ run (e.g. 'moisture-related') are tried
+# first, then every word is looked up in TAGALOG_WORD_TRANSLATIONS instead of scanning each
+# position against every key. No translation produces another English key, so one pass matches
+# the old one-substitution-per-word loop.
+TAGALOG_WORD_RE = re.compile(
+    "|".join(
+        [r'\b' + re.escape(key) + r'\b' for key in sorted(TAGALOG_WORD_TRANSLATIONS, key=len, reverse=True)
+         if not re.fullmatch(r'\w+', key)] + [r'\w+']
+    ),
+    re.IGNORECASE
+)
+TAGALOG_NATURAL_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), improvement) for pattern, improvement in TAGALOG_NATURAL_IMPROVEMENTS.items()
+]
+TAGALOG_POLISH_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in TAGALOG_POLISH_REPLACEMENTS.items()
+]
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def translate_word_match(match: re.Match) -> str:
+    """Tagalog translation of a TAGALOG_WORD_RE token, or the token itself"""
+    # casefold also maps the non-ASCII letters IGNORECASE accepts (e.g. the long s) to the keys
+    word = match.group(0)
+    return TAGALOG_WORD_TRANSLATIONS.get(word.casefold(), word)
+
+
+@lru_cache(maxsize=1024)
 def rule_based_tagalog_translation(text: str) -> str:
     """
     Rule-based translation for common maintenance terms
     Provides natural, conversational Tagalog
     """
-    
-    # Common maintenance phrases (English -> Natural Tagalog)
-    translations = {
-        # Problems - more natural terms
-        'crack': 'may bitak',
-        'cracking': 'bumibitak',
-        'leak': 'may tagas',
-        'leaking': 'tumatagas',
-        'damage': 'nasira',
-        'damaged': 'sira',
-        'broken': 'basag',
-        'stain': 'mantsa',
-        'staining': 'namimintana',
-        'rust': 'kalawang',
-        'corrosion': 'kinakalawang',
-        'mold': 'amag',
-        'hole': 'butas',
-        'peeling': 'nakakalpak',
-        'deterioration': 'luma na',
-        'failure': 'nasira',
-        'breach': 'sirado',
-        'discoloration': 'kupas',
-        'wear': 'gasgas',
-        
-        # Components - more natural terms
-        'wall': 'pader',
-        'ceiling': 'kisame', 
-        'floor': 'sahig',
-        'pipe': 'tubo',
-        'plumbing': 'tubo ng tubig',
-        'electrical': 'kuryente',
-        'wire': 'kawad',
-        'wiring': 'mga kawad',
-        'outlet': 'saksakan',
-        'toilet': 'kubeta',
-        'sink': 'lababo',
-        'faucet': 'gripo',
-        'structure': 'istruktura',
-        'fixture': 'kagamitan',
-        'system': 'sistema',
-        'component': 'parte',
-        
-        # Severity - more natural expressions
-        'severe': 'malala',
-        'serious': 'seryoso',
-        'major': 'malaki',
-        'significant': 'malaki',
-        'extensive': 'malawak',
-        'notable': 'kapansin-pansin',
-        
-        # Actions - more natural verbs
-        'repair': 'kumpunihin',
-        'fix': 'ayusin',
-        'replace': 'palitan',
-        'inspect': 'tingnan',
-        'inspection': 'pagsusuri',
-        'maintenance': 'pag-aayos',
-        'attention': 'ating pansin',
-        'immediate': 'kaagad',
-        'urgent': 'madalian',
-        'prompt': 'agaran',
-        'scheduled': 'nakatakda',
-        'recommended': 'irerekomenda',
-        'professional': 'eksperto',
-        'assessment': 'pagtasa',
-        
-        # Descriptors - more natural phrasing
-        'requires': 'kailangan',
-        'requiring': 'nangangailangan',
-        'observed': 'napansin',
-        'detected': 'nakita',
-        'identified': 'natukoy',
-        'issue': 'problema',
-        'problem': 'sira',
-        'property': 'bahay',
-        'prevent': 'maiwasan',
-        'further': 'lalong',
-        'water': 'tubig',
-        'infiltration': 'tagas',
-        'biological': 'amag',
-        'growth': 'dami',
-        'present': 'mayroon',
-        'metal': 'bakal',
-        'structural': 'istruktura',
-        'surface': 'ibabaw',
-        'degradation': 'pagsira',
-        'patching': 'pagsasaayos',
-        'reattachment': 'pagkakabit',
-        'loose': 'maluwag',
-        'detached': 'kalas',
-        'moisture-related': 'may kinalaman sa tubig'
-    }
-    
-    # Translate word by word with natural phrasing
-    text_lower = text.lower()
     translated = text
     
-    # Common phrase replacements for more natural Tagalog
-    phrase_replacements = {
-        r'\bmaintenance issue\b': 'problema sa bahay',
-        r'\brequires attention\b': 'kailangan ng atensyon',
-        r'\bneeds repair\b': 'kailangan ayusin',
-        r'\bprofessional assessment\b': 'tingnan ng eksperto',
-        r'\bwater damage\b': 'sira mula sa tubig',
-        r'\bstructural damage\b': 'sira sa istruktura',
-        r'\belectrical problem\b': 'problema sa kuryente',
-        r'\bplumbing issue\b': 'problema sa tubig',
-        r'\bsafety hazard\b': 'delikado',
-        r'\bimmediate action\b': 'kaagad na aksyon',
-        r'\bprompt attention\b': 'agad na atensyon',
-        r'\bproperty maintenance\b': 'pag-aayos ng bahay',
-        r'\bbuilding defect\b': 'depekto ng bahay',
-        r'\bcomponent failure\b': 'nasirang parte',
-        r'\bsurface degradation\b': 'sira sa ibabaw',
-        r'\bmoisture infiltration\b': 'pasok ng tubig',
-        r'\bprofessional repair\b': 'pagkukumpuni ng eksperto'
-    }
-    
     # Apply phrase replacements first
-    for english_phrase, tagalog_phrase in phrase_replacements.items():
-        translated = re.sub(english_phrase, tagalog_phrase, translated, flags=re.IGNORECASE)
+    for pattern, tagalog_phrase in TAGALOG_PHRASE_PATTERNS:
+        translated = pattern.sub(tagalog_phrase, translated)
     
-    # Then apply word-by-word translation
-    for english, tagalog in translations.items():
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(english) + r'\b'
-        translated = re.sub(pattern, tagalog, translated, flags=re.IGNORECASE)
+    # Then apply word-by-word translation (word boundaries avoid partial matches)
+    translated = TAGALOG_WORD_RE.sub(translate_word_match, translated)
     
     # Post-processing for more natural Tagalog
-    natural_improvements = {
-        r'\bkailangan ng kumpuni\b': 'kailangan kumpunihin',
-        r'\bkailangan ng ayos\b': 'kailangan ayusin',
-        r'\bproblema sa problema\b': 'problema',
-        r'\bsira na sira\b': 'sira',
-        r'\bdelikado na delikado\b': 'delikado',
-        r'\bmadalian na madalian\b': 'madalian',
-        r'\bkaagad na kaagad\b': 'kaagad',
-        r'\bagaran na agaran\b': 'agaran'
-    }
-    
-    for pattern, improvement in natural_improvements.items():
-        translated = re.sub(pattern, improvement, translated, flags=re.IGNORECASE)
+    for pattern, improvement in TAGALOG_NATURAL_PATTERNS:
+        translated = pattern.sub(improvement, translated)
     
     return translated
 
 
+@lru_cache(maxsize=1024)
 def ensure_natural_tagalog(text: str) -> str:
     """Polish translated text to sound natural in Tagalog"""
     if not text:
@@ -1068,35 +1662,14 @@ def ensure_natural_tagalog(text: str) -> str:
     
     polished = rule_based_tagalog_translation(text)
     
-    replacements = {
-        r'\bmaintenance\b': 'pagpapanatili',
-        r'\bissue\b': 'problema',
-        r'\bproblem\b': 'suliranin',
-        r'\bcomponent\b': 'bahagi',
-        r'\bsystem\b': 'sistema',
-        r'\bplease\b': 'pakiusap',
-        r'\bmanager\b': 'tagapamahala',
-        r'\bdamage\b': 'sira',
-        r'\brepair\b': 'pag-aayos',
-        r'\bcheck\b': 'suriin',
-        r'\binspect\b': 'siyasatin',
-        r'\bhelp\b': 'tulong',
-        r'\btenant\b': 'nangungupahan',
-        r'\barea\b': 'bahagi',
-        r'\bsevere\b': 'malala',
-        r'\burgent\b': 'agaran',
-        r'\bplease help\b': 'pakiusap tulungan',
-        r'\band\b': 'at'
-    }
+    for pattern, replacement in TAGALOG_POLISH_PATTERNS:
+        polished = pattern.sub(replacement, polished)
     
-    for pattern, replacement in replacements.items():
-        polished = re.sub(pattern, replacement, polished, flags=re.IGNORECASE)
-    
-    polished = re.sub(r'\s+', ' ', polished).strip()
+    polished = " ".join(polished.split())
     if not polished:
         return polished
     
-    sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', polished) if s.strip()]
+    sentences = [s.strip() for s in SENTENCE_SPLIT_RE.split(polished) if s.strip()]
     normalized_sentences = []
     for sentence in sentences:
         if not sentence:
@@ -1119,6 +1692,18 @@ def format_tl_list(items: List[str]) -> str:
     return f"{', '.join(filtered_items[:-1])} at {filtered_items[-1]}"
 
 
+# Tenant's closing remark on urgency, per severity level
+TENANT_SEVERITY_SENTENCES_TL = {
+    "mataas": "Delikado na ito para sa amin kaya umaasa akong maagapan agad.",
+    "katamtaman": "Hindi pa naman emergency pero gusto ko sanang maipasilip sa lalong madaling panahon.",
+    "mababa": "Kayang tiisin sandali pero mas mabuti nang maagapan bago lumala."
+}
+
+# Fixed opening and closing lines of the tenant narrative
+TENANT_GREETING_TL = "Magandang araw po. Ako ang nangungupahan sa unit at nais kong i-report ang makikita sa litrato."
+TENANT_CLOSING_TL = "Pakitulungan naman po kaming maayos ito habang malinaw pa sa litrato. Maraming salamat."
+
+
 def build_tenant_conversation(tagalog_context: str, analysis: Dict[str, Any]) -> str:
     """Create conversational Tagalog narrative from tenant perspective"""
     components = format_tl_list(analysis.get("components", []))
@@ -1126,14 +1711,8 @@ def build_tenant_conversation(tagalog_context: str, analysis: Dict[str, Any]) ->
     locations = format_tl_list(analysis.get("locations", []))
     severity = analysis.get("severity_level", "katamtaman")
     
-    severity_map = {
-        "mataas": "Delikado na ito para sa amin kaya umaasa akong maagapan agad.",
-        "katamtaman": "Hindi pa naman emergency pero gusto ko sanang maipasilip sa lalong madaling panahon.",
-        "mababa": "Kayang tiisin sandali pero mas mabuti nang maagapan bago lumala."
-    }
-    
     sentence_parts = [
-        "Magandang araw po. Ako ang nangungupahan sa unit at nais kong i-report ang makikita sa litrato.",
+        TENANT_GREETING_TL,
         f"Sa kuha, mapapansin ninyo na {tagalog_context.strip()}",
     ]
     
@@ -1144,10 +1723,11 @@ def build_tenant_conversation(tagalog_context: str, analysis: Dict[str, Any]) ->
     if locations:
         sentence_parts.append(f"Nangyayari ito sa {locations}.")
     
-    sentence_parts.append(severity_map.get(severity, severity_map["katamtaman"]))
-    sentence_parts.append("Pakitulungan naman po kaming maayos ito habang malinaw pa sa litrato. Maraming salamat.")
+    sentence_parts.append(TENANT_SEVERITY_SENTENCES_TL.get(severity, TENANT_SEVERITY_SENTENCES_TL["katamtaman"]))
+    sentence_parts.append(TENANT_CLOSING_TL)
     
-    return " ".join(segment for segment in sentence_parts if segment).strip()
+    # Every part is non-empty: the optional ones are only appended when set
+    return " ".join(sentence_parts).strip()
 
 
 async def generate_tagalog_outputs(basic_description: str, expanded_description: str, analysis: Dict[str, Any]) -> Dict[str, str]:
@@ -1164,95 +1744,319 @@ async def generate_tagalog_outputs(basic_description: str, expanded_description:
 
 # IMAGE PROCESSING FUNCTIONS
 
+def move_inputs_to_device(inputs) -> Dict[str, Any]:
+    """Move processor outputs to the inference device, casting pixel values to the model dtype"""
+    if DEVICE != "cuda":
+        if MODEL_DTYPE == torch.float32:
+            return dict(inputs)
+        return {k: v.to(MODEL_DTYPE) if v.is_floating_point() else v for k, v in inputs.items()}
+    
+    # Pinned host buffers let the host-to-device copy run asynchronously
+    return {
+        k: v.pin_memory().to(DEVICE, dtype=MODEL_DTYPE, non_blocking=True) if v.is_floating_point()
+        else v.pin_memory().to(DEVICE, non_blocking=True)
+        for k, v in inputs.items()
+    }
+
+
+def autocast_context():
+    """Mixed-precision context for generate calls (no-op for float32 on CPU)"""
+    if DEVICE == "cuda":
+        return torch.autocast("cuda", dtype=MODEL_DTYPE)
+    if MODEL_DTYPE == torch.bfloat16:
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+    return nullcontext()
+
+
+def downscale_for_captioning(image: Image.Image) -> Image.Image:
+    """Shrink large uploads in place; BLIP resizes to 384x384 so extra pixels are wasted work"""
+    image.thumbnail(CAPTION_IMAGE_MAX_SIZE, Image.Resampling.BILINEAR)
+    return image
+
+
+def check_image_size(shorter_side: int, min_size: int):
+    """Reject uploads whose shorter side is below min_size pixels"""
+    if shorter_side < min_size:
+        raise HTTPException(status_code=400, detail="Image is too small for analysis")
+
+
+def open_upload_image(source) -> Image.Image:
+    """Image.open for an upload, rejecting unreadable files (400) and decompression bombs (413)"""
+    try:
+        return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    except Image.DecompressionBombError:
+        # PIL's default limit checks the header's dimensions before any pixels are decoded
+        raise HTTPException(status_code=413, detail="Image dimensions are too large")
+    except UnidentifiedImageError:
+        raise HTTPException(status_code=400, detail="File is not a readable image")
+
+
+def load_caption_image(source, min_size: int = 0) -> Tuple[Image.Image, int]:
+    """Decode an upload (bytes or file object) to RGB, downscale and enhance it for captioning (CPU-bound)
+    
+    Returns the enhanced image and the shorter side of the original upload.
+    """
+    image = open_upload_image(source)
+    shorter_side = min(image.size)
+    
+    # Validate image size
+    check_image_size(shorter_side, min_size)
+    
+    # Let the JPEG decoder scale down by DCT (up to 8x) before conversion loads the pixels,
+    # keeping twice the target size so the final resize still has detail to work with
+    image.draft('RGB', (CAPTION_IMAGE_MAX_SIZE[0] * 2, CAPTION_IMAGE_MAX_SIZE[1] * 2))
+    
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    return enhanced_image_processing(downscale_for_captioning(image)), shorter_side
+
+
 def enhanced_image_processing(image: Image.Image) -> Image.Image:
     """Enhanced image preprocessing for better analysis"""
     try:
-        # Enhance image quality
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.2)
-        
-        enhancer = ImageEnhance.Sharpness(image)
-        image = enhancer.enhance(1.1)
-        
-        enhancer = ImageEnhance.Brightness(image)
-        image = enhancer.enhance(1.05)
-        
-        return image
+        # Contrast (pivoting on mean luminance, as ImageEnhance.Contrast does) and brightness are
+        # both per-pixel, so fold them into one lookup table applied in a single pass. Brightness
+        # used to run after sharpening; both are linear, so moving it first only shifts rounding.
+        mean = int(ImageStat.Stat(image.convert("L")).mean[0] + 0.5)
+        lut = []
+        for value in range(256):
+            contrasted = min(255, max(0, int(mean + 1.2 * (value - mean))))
+            lut.append(min(255, int(contrasted * 1.05)))
+        image = image.point(lut * len(image.getbands()))
+        
+        return ImageEnhance.Sharpness(image).enhance(1.1)
     except Exception as e:
         logger.warning(f"Image enhancement failed: {e}")
         return image
 
 
 def multi_model_caption_generation(image: Image.Image) -> str:
-    """Generate captions using multiple models for better accuracy"""
+    """Generate a caption for one image using the multi-model fallback chain"""
+    caption = batch_caption_generation([image])[0]
+    if caption is None:
+        raise Exception("All captioning strategies failed")
+    return caption
+
+
+def encode_caption_images(images: List[Image.Image]):
+    """Run the BLIP vision encoder once so every caption prompt can reuse the image embeddings"""
+    # Prompts are pre-tokenized, so only the image processor runs per request
+    inputs = move_inputs_to_device(processor_blip.image_processor(images, return_tensors="pt"))
     
-    captions = []
+    with torch.inference_mode(), autocast_context():
+        # Positional call so a TorchScript-traced encoder works the same way
+        return model_blip.vision_model(inputs["pixel_values"])[0]
+
+
+def decode_blip_captions(image_embeds, prompt: Optional[str] = None) -> List[str]:
+    """Generate captions from precomputed BLIP image embeddings (mirrors BlipForConditionalGeneration.generate)"""
+    text_config = model_blip.config.text_config
+    batch_size = image_embeds.size(0)
     
-    # Strategy 1: BLIP with different prompts
-    blip_prompts = [
-        "maintenance issue damage repair",
-        "property inspection problem",
-        "a photo of",
-        "what is wrong with this"
-    ]
+    if prompt:
+        input_ids = blip_prompt_ids[prompt].repeat(batch_size, 1)
+    else:
+        input_ids = torch.LongTensor([[model_blip.decoder_input_ids, text_config.eos_token_id]]).repeat(batch_size, 1)
+    input_ids = input_ids.to(image_embeds.device)
+    input_ids[:, 0] = text_config.bos_token_id
+    
+    image_attention_mask = torch.ones(image_embeds.size()[:-1], dtype=torch.long, device=image_embeds.device)
+    
+    with torch.inference_mode(), autocast_context():
+        out = model_blip.text_decoder.generate(
+            input_ids=input_ids[:, :-1],
+            eos_token_id=text_config.sep_token_id,
+            pad_token_id=text_config.pad_token_id,
+            encoder_hidden_states=image_embeds,
+            encoder_attention_mask=image_attention_mask,
+            **BLIP_GENERATION_KWARGS
+        )
+    
+    return processor_blip.batch_decode(out, skip_special_tokens=True)
+
+
+def generate_blip2_captions(images: List[Image.Image]) -> List[str]:
+    """Caption a batch of images with BLIP-2 (raw decoded text)"""
+    # Every row shares one prompt, so the tokenized batch never needs padding
+    inputs = processor_blip2(images=images, text=[BLIP2_CAPTION_PROMPT] * len(images), return_tensors="pt")
+    
+    inputs = move_inputs_to_device(inputs)
+    
+    with torch.inference_mode(), autocast_context():
+        out = model_blip2.generate(**inputs, max_length=100)
+    
+    return processor_blip2.batch_decode(out, skip_special_tokens=True)
+
+
+def batch_caption_generation(images: List[Image.Image]) -> List[Optional[str]]:
+    """Generate captions for several images, batching every generate call across images
+    
+    The vision encoder runs once per image; each prompt only re-runs the text decoder, and
+    strategies form a lazy fallback chain: each later prompt (and BLIP-2) only runs on the
+    images that have no valid caption yet. Images without any usable caption get None.
+    """
+    
+    captions: List[Optional[str]] = [None] * len(images)
     
-    for prompt in blip_prompts:
+    try:
+        image_embeds = encode_caption_images(images)
+    except Exception as e:
+        logger.warning(f"BLIP image encoding failed: {e}")
+        image_embeds = None
+    
+    # Strategy 1: BLIP with different prompts, one deterministic beam pass each over the shared embeddings
+    for prompt in BLIP_CAPTION_PROMPTS if image_embeds is not None else []:
+        pending = [index for index, caption in enumerate(captions) if caption is None]
+        if not pending:
+            break
+        
         try:
-            if prompt == "a photo of":
-                inputs = processor_blip(image, return_tensors="pt")
-            else:
-                inputs = processor_blip(image, prompt, return_tensors="pt")
-            
-            if torch.cuda.is_available():
-                inputs = {k: v.to("cuda") for k, v in inputs.items()}
+            embeds = image_embeds if len(pending) == len(images) else image_embeds[pending]
+            decoded = decode_blip_captions(embeds, None if prompt == "a photo of" else prompt)
             
-            with torch.no_grad():
-                out = model_blip.generate(
-                    **inputs,
-                    max_length=100,
-                    num_beams=5,
-                    temperature=0.8,
-                    do_sample=True,
-                    early_stopping=True
-                )
-            
-            caption = processor_blip.decode(out[0], skip_special_tokens=True)
-            if is_valid_caption(caption, prompt):
-                captions.append(caption)
-                
+            for index, caption in zip(pending, decoded):
+                if is_valid_caption(caption, prompt):
+                    captions[index] = caption
+                    
         except Exception as e:
             logger.warning(f"BLIP captioning with prompt '{prompt}' failed: {e}")
     
-    # Strategy 2: BLIP-2 for more detailed analysis
+    # Strategy 2: BLIP-2 for the images BLIP could not describe
+    pending = [index for index, caption in enumerate(captions) if caption is None]
     try:
-        if processor_blip2 is not None and model_blip2 is not None:
-            prompt = "Question: What maintenance issues can you see? Answer:"
-            inputs = processor_blip2(image, prompt, return_tensors="pt")
-            
-            if torch.cuda.is_available():
-                inputs = {k: v.to("cuda") for k, v in inputs.items()}
-            
-            with torch.no_grad():
-                out = model_blip2.generate(**inputs, max_length=100)
-            
-            caption = processor_blip2.decode(out[0], skip_special_tokens=True)
-            # Extract just the answer part
-            if "Answer:" in caption:
-                caption = caption.split("Answer:")[-1].strip()
-            captions.append(caption)
-        else:
+        if pending and processor_blip2 is not None and model_blip2 is not None:
+            batch = [images[index] for index in pending]
+            for index, caption in zip(pending, generate_blip2_captions(batch)):
+                # Extract just the answer part
+                if "Answer:" in caption:
+                    caption = caption.split("Answer:")[-1].strip()
+                if caption:
+                    captions[index] = caption
+        elif pending:
             logger.info("BLIP-2 not available, skipping")
             
     except Exception as e:
         logger.warning(f"BLIP-2 captioning failed: {e}")
     
-    # Select the best caption
-    if captions:
-        # Prefer longer, more descriptive captions
-        best_caption = max(captions, key=lambda x: len(x.split()))
-        return enhance_description(best_caption)
-    else:
-        raise Exception("All captioning strategies failed")
+    return [enhance_description(caption) if caption is not None else None for caption in captions]
+
+
+async def collect_batch(queue: asyncio.Queue, max_batch: int, max_latency: float, batch: Optional[list] = None) -> list:
+    """Wait for one queued item, then take more until max_batch items or max_latency seconds
+    
+    Items are appended to batch when given, so a cancelled caller still knows what it took off the queue.
+    """
+    loop = asyncio.get_running_loop()
+    if batch is None:
+        batch = []
+    batch.append(await queue.get())
+    deadline = loop.time() + max_latency
+    
+    while len(batch) < max_batch:
+        timeout = deadline - loop.time()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout))
+        except asyncio.TimeoutError:
+            break
+    
+    return batch
+
+
+class BlipBatcher:
+    """Micro-batcher that coalesces concurrent captioning requests into one BLIP pass"""
+    
+    def __init__(self, max_batch: int = 8, max_latency_ms: float = 20, max_pending: int = 64):
+        self.max_batch = max_batch
+        self.max_latency = max_latency_ms / 1000
+        self.max_pending = max_pending
+        self.queue: Optional[asyncio.Queue] = None
+        self.task: Optional[asyncio.Task] = None
+        self.batch: list = []
+    
+    def start(self):
+        """Start the background runner on the running event loop"""
+        if self.task is None:
+            # Bounded so a burst of uploads waits in submit() instead of piling up decoded images
+            self.queue = asyncio.Queue(maxsize=self.max_pending)
+            self.task = asyncio.create_task(self.runner())
+    
+    async def stop(self):
+        """Cancel the background runner and fail every request it would have answered"""
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            
+            leftover = self.batch
+            while not self.queue.empty():
+                leftover.append(self.queue.get_nowait())
+            self.fail(leftover, Exception("Captioning batcher stopped"))
+            self.batch = []
+    
+    @staticmethod
+    def fail(batch: list, error: Exception):
+        """Resolve the batch's pending futures with error"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+    
+    async def submit(self, image: Image.Image) -> str:
+        """Queue an image and wait for its caption (captioned directly when the runner is not running)"""
+        if self.task is None or self.task.done():
+            return await asyncio.get_running_loop().run_in_executor(inference_pool, multi_model_caption_generation, image)
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((image, future))
+        return await future
+    
+    async def runner(self):
+        """Drain the queue into batches of up to max_batch images or max_latency seconds"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            # Any error fails this batch's callers and the runner carries on; a dead runner
+            # would leave every later submit() waiting forever
+            self.batch = []
+            try:
+                batch = await collect_batch(self.queue, self.max_batch, self.max_latency, self.batch)
+                
+                images = [image for image, _ in batch]
+                captions = await loop.run_in_executor(inference_pool, batch_caption_generation, images)
+                if len(captions) != len(batch):
+                    raise Exception(f"Got {len(captions)} captions for {len(batch)} images")
+                
+                for (_, future), caption in zip(batch, captions):
+                    if future.done():
+                        continue
+                    if caption is None:
+                        future.set_exception(Exception("All captioning strategies failed"))
+                    else:
+                        future.set_result(caption)
+            except Exception as e:
+                logger.warning(f"Batched captioning of {len(self.batch)} images failed: {e}")
+                self.fail(self.batch, e)
+
+
+blip_batcher = BlipBatcher(
+    max_batch=int(os.getenv("BLIP_MAX_BATCH", 8)),
+    max_latency_ms=float(os.getenv("BLIP_MAX_LATENCY_MS", 20)),
+    max_pending=int(os.getenv("BLIP_MAX_PENDING", 64))
+)
+
+
+# Words that make a caption maintenance-relevant, matched as substrings in one pass
+CAPTION_INDICATORS = (
+    'crack', 'leak', 'break', 'damage', 'stain', 'rust', 'mold',
+    'hole', 'tear', 'wear', 'wall', 'ceiling', 'floor', 'pipe',
+    'wire', 'paint', 'surface', 'structure', 'issue', 'problem'
+)
+CAPTION_INDICATOR_RE = re.compile("|".join(CAPTION_INDICATORS), re.IGNORECASE)
 
 
 def is_valid_caption(caption: str, prompt: str) -> bool:
@@ -1260,18 +2064,16 @@ def is_valid_caption(caption: str, prompt: str) -> bool:
     if not caption or len(caption.strip()) < 10:  # Reduced from 15
         return False
     
-    caption_lower = caption.lower()
-    
     # Don't reject just because of prompt words
-    # Instead, check for meaningful content
-    maintenance_indicators = [
-        'crack', 'leak', 'break', 'damage', 'stain', 'rust', 'mold',
-        'hole', 'tear', 'wear', 'wall', 'ceiling', 'floor', 'pipe',
-        'wire', 'paint', 'surface', 'structure', 'issue', 'problem'
-    ]
-    
-    valid_words = sum(1 for word in maintenance_indicators if word in caption_lower)
-    return valid_words >= 1  # At least one maintenance-related word
+    # Instead, check for meaningful content: at least one maintenance-related word
+    return CAPTION_INDICATOR_RE.search(caption) is not None
+
+
+# Caption filler phrases stripped by enhance_description
+CAPTION_FILLER_RE = re.compile(
+    r'\b(?:this is a picture of|there is a|this image shows|this is an image of|you can see|in this photo|the image shows|we can see)\b',
+    re.IGNORECASE
+)
 
 
 def enhance_description(description: str) -> str:
@@ -1280,49 +2082,52 @@ def enhance_description(description: str) -> str:
         return "Unable to analyze image content"
     
     # Clean up common issues
-    cleanup_patterns = [
-        (r'\b(this is a picture of|there is a|this image shows|this is an image of|you can see|in this photo|the image shows|we can see)\b', ''),
-        (r'\s+', ' '),
-    ]
-    
-    for pattern, replacement in cleanup_patterns:
-        description = re.sub(pattern, replacement, description, flags=re.IGNORECASE)
-    
-    description = description.strip()
+    description = " ".join(CAPTION_FILLER_RE.sub('', description).split())
     
     # Ensure proper capitalization and punctuation
     if description:
         description = description[0].upper() + description[1:]
-        if not description.endswith(('.', '!', '?')):
+        if description[-1] not in '.!?':
             description += '.'
     
     return description
 
 
+def compress_for_upload(image_data: bytes) -> bytes:
+    """Re-encode an image as a small JPEG (no EXIF/ICC) for remote captioning (CPU-bound)"""
+    image = open_upload_image(image_data)
+    image.draft('RGB', (CAPTION_IMAGE_MAX_SIZE[0] * 2, CAPTION_IMAGE_MAX_SIZE[1] * 2))
+    image = downscale_for_captioning(image.convert('RGB'))
+    
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85, optimize=True)
+    return buffer.getvalue()
+
+
 async def analyze_with_hf_api_advanced(image_data: bytes, filename: str) -> str:
     """Advanced Hugging Face API analysis with multiple endpoints"""
     
     if not HF_TOKEN:
         raise Exception("HF_API_KEY not configured")
     
+    # Remote models also work at 384px, so send a compact JPEG instead of the raw upload
+    headers = None
+    try:
+        image_data = await asyncio.get_running_loop().run_in_executor(image_pool, compress_for_upload, image_data)
+        headers = {"Content-Type": "image/jpeg"}
+    except HTTPException:
+        # Rejected uploads are never forwarded as-is
+        raise
+    except Exception as e:
+        logger.warning(f"Could not compress {filename} for upload, sending original: {e}")
+    
     # Try multiple endpoints
-    endpoints = [
-        ("https://api-inference.huggingface.co/models/Salesforce/blip-image-captioning-large", {}),
-        ("https://api-inference.huggingface.co/models/Salesforce/blip2-opt-2.7b", {"parameters": {"max_length": 100}}),
-    ]
+    endpoints = [BLIP_LARGE_URL, BLIP2_URL]
     
-    for endpoint, params in endpoints:
+    for endpoint in endpoints:
         try:
-            response = requests.post(
-                endpoint,
-                headers={"Authorization": f"Bearer {HF_TOKEN}"},
-                data=image_data,
-                json=params,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
+            result = await post_huggingface(endpoint, headers=headers, data=image_data)
+            if result is not None:
                 caption = result[0]['generated_text']
                 enhanced_caption = enhance_description(caption)
                 logger.info(f"HF API success for {filename} from {endpoint}: {enhanced_caption}")
@@ -1335,16 +2140,42 @@ async def analyze_with_hf_api_advanced(image_data: bytes, filename: str) -> str:
     raise Exception("All Hugging Face API endpoints failed")
 
 
+# Keyword vocabulary for enhance_analysis_with_context, built once at import
+MAINTENANCE_PATTERNS = {
+    'structural': frozenset(['wall', 'ceiling', 'floor', 'foundation', 'beam', 'drywall', 'door', 'doorknob', 'knob', 'handle']),
+    'plumbing': frozenset(['pipe', 'leak', 'faucet', 'sink', 'toilet', 'drain', 'water', 'exposed', 'plumbing']),
+    'electrical': frozenset(['wire', 'outlet', 'switch', 'breaker', 'electrical', 'circuit', 'wiring']),
+    'problems': frozenset(['broken', 'cracked', 'damaged', 'leaking', 'stained', 'corroded', 'old', 'dilapidated', 'worn', 'exposed', 'missing', 'hole', 'deteriorated', 'rusted', 'peeling']),
+    'severity': frozenset(['large', 'major', 'severe', 'significant', 'extensive', 'serious', 'bad', 'poor'])
+}
+
+
+# Single-pass substring scan over every category (overlapping hits included)
+MAINTENANCE_AUTOMATON = build_keyword_automaton(MAINTENANCE_PATTERNS)
+
+
+# Analysis fields set per keyword score, highest threshold first (scores are never negative)
+ANALYSIS_SCORE_TIERS = (
+    (6, {"confidence": "high", "risk_level": "high", "maintenance_priority": "urgent", "severity_level": "mataas"}),
+    (3, {"confidence": "medium", "risk_level": "medium", "maintenance_priority": "medium", "severity_level": "katamtaman"}),
+    (1, {"confidence": "medium", "risk_level": "low", "maintenance_priority": "low", "severity_level": "mababa"}),
+    (0, {"severity_level": "mababa"})
+)
+
+
 def enhance_analysis_with_context(description: str) -> dict:
-    """Enhanced maintenance content analysis"""
-    
-    maintenance_patterns = {
-        'structural': ['wall', 'ceiling', 'floor', 'foundation', 'beam', 'drywall', 'door', 'doorknob', 'knob', 'handle'],
-        'plumbing': ['pipe', 'leak', 'faucet', 'sink', 'toilet', 'drain', 'water', 'exposed', 'plumbing'],
-        'electrical': ['wire', 'outlet', 'switch', 'breaker', 'electrical', 'circuit', 'wiring'],
-        'problems': ['broken', 'cracked', 'damaged', 'leaking', 'stained', 'corroded', 'old', 'dilapidated', 'worn', 'exposed', 'missing', 'hole', 'deteriorated', 'rusted', 'peeling'],
-        'severity': ['large', 'major', 'severe', 'significant', 'extensive', 'serious', 'bad', 'poor']
-    }
+    """Enhanced maintenance content analysis (lowercases the description itself), cached by text"""
+    analysis = analysis_cache.get(description)
+    if analysis is None:
+        analysis = build_context_analysis(description)
+        analysis_cache.set(description, analysis)
+    
+    # Callers get their own dict and lists, so none of them can change the cached entry
+    return {key: list(value) if isinstance(value, list) else value for key, value in analysis.items()}
+
+
+def build_context_analysis(description: str) -> dict:
+    """Keyword analysis behind enhance_analysis_with_context"""
     
     analysis = {
         "components": [],
@@ -1360,37 +2191,28 @@ def enhance_analysis_with_context(description: str) -> dict:
     
     description_lower = description.lower()
     
-    for category, keywords in maintenance_patterns.items():
-        found = [kw for kw in keywords if kw in description_lower]
-        if found:
-            if category in ['structural', 'plumbing', 'electrical']:
-                analysis["components"].extend(found)
-            elif category == 'problems':
-                analysis["problems"].extend(found)
-            elif category == 'severity':
-                analysis["severity_indicators"].extend(found)
-    
-    # Remove duplicates
-    analysis["components"] = list(set(analysis["components"]))
-    analysis["problems"] = list(set(analysis["problems"]))
-    analysis["severity_indicators"] = list(set(analysis["severity_indicators"]))
+    hits = {category: {} for category in MAINTENANCE_PATTERNS}
+    for _, (keyword, categories) in MAINTENANCE_AUTOMATON.iter(description_lower):
+        for category in categories:
+            hits[category].setdefault(keyword)
+    
+    # Build each deduplicated list once, in order of first occurrence
+    analysis["components"] = list(dict.fromkeys(chain(hits["structural"], hits["plumbing"], hits["electrical"])))
+    analysis["problems"] = list(hits["problems"])
+    analysis["severity_indicators"] = list(hits["severity"])
+    
+    component_count = len(analysis["components"])
+    problem_count = len(analysis["problems"])
     
     # Enhanced scoring - MORE SENSITIVE TO ISSUES
-    score = len(analysis["components"]) * 2 + len(analysis["problems"]) * 3 + len(analysis["severity_indicators"]) * 2
+    score = component_count * 2 + problem_count * 3 + len(analysis["severity_indicators"]) * 2
     
     # Lower thresholds to catch more issues
-    if score >= 6:
-        analysis.update({"confidence": "high", "risk_level": "high", "maintenance_priority": "urgent", "severity_level": "mataas"})
-    elif score >= 3:
-        analysis.update({"confidence": "medium", "risk_level": "medium", "maintenance_priority": "medium", "severity_level": "katamtaman"})
-    elif score >= 1:
-        analysis.update({"confidence": "medium", "risk_level": "low", "maintenance_priority": "low", "severity_level": "mababa"})
-    else:
-        analysis.update({"severity_level": "mababa"})
+    analysis.update(next(fields for threshold, fields in ANALYSIS_SCORE_TIERS if score >= threshold))
     
     # If ANY problem is found, it's maintenance related
-    analysis["isMaintenanceRelated"] = len(analysis["problems"]) > 0 or len(analysis["components"]) > 0
-    analysis["contextual_analysis"] = f"Found {len(analysis['problems'])} issues affecting {len(analysis['components'])} components"
+    analysis["isMaintenanceRelated"] = problem_count > 0 or component_count > 0
+    analysis["contextual_analysis"] = f"Found {problem_count} issues affecting {component_count} components"
     
     return analysis
 
@@ -1398,32 +2220,46 @@ def enhance_analysis_with_context(description: str) -> dict:
 # REQUEST ANALYSIS FUNCTIONS (NEW)
 
 async def summarize_request_with_ai(text: str) -> str:
-    """Summarize maintenance request using AI"""
+    """Summarize maintenance request using AI, cached by content hash"""
+    key = content_hash(text)
+    summary = summary_cache.get(key)
+    if summary is not None:
+        return summary
+    
+    task = summary_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run_ai_summarization(text))
+        summary_inflight[key] = task
+        task.add_done_callback(lambda _: summary_inflight.pop(key, None))
+    
+    # Shielded so one cancelled caller does not cancel the summarization for the others
+    summary = await asyncio.shield(task)
+    if summary:
+        summary_cache.set(key, summary)
+        return summary
+    
+    # Fallback to rule-based summarization
+    return rule_based_summarization(text)
+
+async def run_ai_summarization(text: str) -> Optional[str]:
+    """Summarize with the AI providers (None when none of them answers)"""
     try:
-        # Try Hugging Face first
+        # Race the configured AI services; the first useful summary wins
+        providers = []
         if HF_TOKEN:
-            summary = await summarize_with_huggingface(text)
-            if summary:
-                return summary
-        
-        # Try OpenAI if available
+            providers.append(summarize_with_huggingface(text))
         if OPENAI_API_KEY:
-            summary = await summarize_with_openai(text)
-            if summary:
-                return summary
+            providers.append(summarize_with_openai(text))
         
-        # Fallback to rule-based summarization
-        return rule_based_summarization(text)
+        return await first_successful(providers, AI_ANALYSIS_TIMEOUT)
         
     except Exception as e:
         logger.warning(f"AI summarization failed: {e}")
-        return rule_based_summarization(text)
+        return None
 
 async def summarize_with_huggingface(text: str) -> str:
     """Summarize using Hugging Face API"""
     try:
-        headers = {"Authorization": f"Bearer {HF_TOKEN}"}
-        
         # Use a model good for summarization
         api_url = "https://api-inference.huggingface.co/models/facebook/bart-large-cnn"
         
@@ -1446,14 +2282,11 @@ async def summarize_with_huggingface(text: str) -> str:
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        summary = result[0].get('generated_text', '')
-                        return clean_summary_text(summary)
-                    
+        result = await post_huggingface(api_url, json=payload)
+        if isinstance(result, list) and len(result) > 0:
+            summary = result[0].get('generated_text', '')
+            return clean_summary_text(summary)
+            
     except Exception as e:
         logger.warning(f"Hugging Face summarization failed: {e}")
         return None
@@ -1461,11 +2294,6 @@ async def summarize_with_huggingface(text: str) -> str:
 async def summarize_with_openai(text: str) -> str:
     """Summarize using OpenAI API"""
     try:
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
         prompt = f"""
         Please summarize this maintenance request into a clear, concise description (2-3 sentences). 
         Focus on the main issue, affected components, and required action:
@@ -1483,26 +2311,22 @@ async def summarize_with_openai(text: str) -> str:
             "temperature": 0.7
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    summary = result['choices'][0]['message']['content'].strip()
-                    return clean_summary_text(summary)
-                    
+        summary = await post_openai(payload)
+        if summary:
+            return clean_summary_text(summary)
+                
     except Exception as e:
         logger.warning(f"OpenAI summarization failed: {e}")
         return None
 
+SENTENCE_END_RE = re.compile(r'[.!?]+')
+
+
+@lru_cache(maxsize=1024)
 def rule_based_summarization(text: str) -> str:
     """Rule-based fallback for summarization"""
     # Simple summarization logic
-    sentences = re.split(r'[.!?]+', text)
+    sentences = SENTENCE_END_RE.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
     
     if len(sentences) <= 3:
@@ -1518,11 +2342,12 @@ def rule_based_summarization(text: str) -> str:
     
     return summary
 
+@lru_cache(maxsize=1024)
 def clean_summary_text(text: str) -> str:
     """Clean up summary text"""
     # Remove common AI artifacts
-    text = re.sub(r'^(Summary:|Here\'s a summary:|The summary is:|In summary:)\s*', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'\n+', ' ', text)
+    text = SUMMARY_PREFIX_RE.sub('', text)
+    text = NEWLINES_RE.sub(' ', text)
     text = text.strip()
     
     # Ensure it ends with punctuation
@@ -1532,32 +2357,47 @@ def clean_summary_text(text: str) -> str:
     return text
 
 async def classify_urgency_with_ai(text: str) -> int:
-    """Classify urgency level using AI (1-4 scale)"""
+    """Classify urgency level using AI (1-4 scale), cached by normalized content hash"""
+    # Case and whitespace differences do not change the urgency of a request
+    key = content_hash(" ".join(text.lower().split()))
+    urgency = urgency_cache.get(key)
+    if urgency is not None:
+        return urgency
+    
+    task = urgency_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(run_urgency_classification(text))
+        urgency_inflight[key] = task
+        task.add_done_callback(lambda _: urgency_inflight.pop(key, None))
+    
+    # Shielded so one cancelled caller does not cancel the classification for the others
+    urgency = await asyncio.shield(task)
+    if urgency:
+        urgency_cache.set(key, urgency)
+        return urgency
+    
+    # Fallback to rule-based urgency classification
+    return rule_based_urgency_classification(text)
+
+async def run_urgency_classification(text: str) -> Optional[int]:
+    """Classify urgency with the AI providers (None when none of them answers)"""
     try:
-        # Try Hugging Face first
+        # Race the configured AI services; the first valid level wins
+        providers = []
         if HF_TOKEN:
-            urgency = await classify_urgency_with_huggingface(text)
-            if urgency:
-                return urgency
-        
-        # Try OpenAI if available
+            providers.append(classify_urgency_with_huggingface(text))
         if OPENAI_API_KEY:
-            urgency = await classify_urgency_with_openai(text)
-            if urgency:
-                return urgency
+            providers.append(classify_urgency_with_openai(text))
         
-        # Fallback to rule-based urgency classification
-        return rule_based_urgency_classification(text)
+        return await first_successful(providers, AI_ANALYSIS_TIMEOUT)
         
     except Exception as e:
         logger.warning(f"AI urgency classification failed: {e}")
-        return rule_based_urgency_classification(text)
+        return None
 
 async def classify_urgency_with_huggingface(text: str) -> int:
     """Classify urgency using Hugging Face API"""
     try:
-        headers = {"Authorization": f"Bearer {HF_TOKEN}"}
-        
         prompt = f"""
         Analyze this maintenance request and classify its urgency level:
         1 - Low (cosmetic, non-urgent)
@@ -1582,17 +2422,14 @@ async def classify_urgency_with_huggingface(text: str) -> int:
             }
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload, timeout=30) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    if isinstance(result, list) and len(result) > 0:
-                        response_text = result[0].get('generated_text', '').strip()
-                        # Extract number from response
-                        numbers = re.findall(r'\b[1-4]\b', response_text)
-                        if numbers:
-                            return int(numbers[0])
-                    
+        result = await post_huggingface(api_url, json=payload)
+        if isinstance(result, list) and len(result) > 0:
+            response_text = result[0].get('generated_text', '').strip()
+            # Extract number from response
+            numbers = URGENCY_DIGIT_RE.findall(response_text)
+            if numbers:
+                return int(numbers[0])
+            
     except Exception as e:
         logger.warning(f"Hugging Face urgency classification failed: {e}")
         return None
@@ -1600,11 +2437,6 @@ async def classify_urgency_with_huggingface(text: str) -> int:
 async def classify_urgency_with_openai(text: str) -> int:
     """Classify urgency using OpenAI API"""
     try:
-        headers = {
-            "Authorization": f"Bearer {OPENAI_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
         prompt = f"""
         Analyze this maintenance request and classify its urgency level. Respond with ONLY the number:
         1 - Low (cosmetic, non-urgent)
@@ -1625,86 +2457,71 @@ async def classify_urgency_with_openai(text: str) -> int:
             "temperature": 0.1
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    response_text = result['choices'][0]['message']['content'].strip()
-                    numbers = re.findall(r'\b[1-4]\b', response_text)
-                    if numbers:
-                        return int(numbers[0])
-                    
+        response_text = await post_openai(payload)
+        if response_text:
+            numbers = URGENCY_DIGIT_RE.findall(response_text)
+            if numbers:
+                return int(numbers[0])
+                
     except Exception as e:
         logger.warning(f"OpenAI urgency classification failed: {e}")
         return None
 
+# Urgency keyword tiers for the rule-based classifier, compiled once at import
+CRITICAL_URGENCY_KEYWORDS = (
+    'gas leak', 'electrical spark', 'fire', 'flood', 'no power', 
+    'broken window', 'no lock', 'no heat', 'no water', 'raw sewage',
+    'exposed wire', 'structural collapse', 'flooding', 'sparking',
+    'smoke', 'burning', 'short circuit', 'electrocution', 'emergency'
+)
+
+HIGH_URGENCY_KEYWORDS = (
+    'leak', 'electrical', 'not working', 'broken', 'clog', 'overflow',
+    'pest', 'mold', 'no hot water', 'water damage', 'exposed pipe',
+    'major', 'severe', 'serious', 'extensive', 'flood', 'burst'
+)
+
+# Both tiers in one single-pass substring scan ('flood' is listed in both)
+URGENCY_AUTOMATON = build_keyword_automaton({
+    "critical": CRITICAL_URGENCY_KEYWORDS,
+    "high": HIGH_URGENCY_KEYWORDS
+})
+URGENCY_DIGIT_RE = re.compile(r'\b[1-4]\b')
+
+
 def rule_based_urgency_classification(text: str) -> int:
     """Rule-based urgency classification as fallback"""
-    text_lower = text.lower()
-    
-    # Critical urgency indicators (level 4)
-    critical_keywords = [
-        'gas leak', 'electrical spark', 'fire', 'flood', 'no power', 
-        'broken window', 'no lock', 'no heat', 'no water', 'raw sewage',
-        'exposed wire', 'structural collapse', 'flooding', 'sparking',
-        'smoke', 'burning', 'short circuit', 'electrocution', 'emergency'
-    ]
-    
-    # High urgency indicators (level 3)
-    high_keywords = [
-        'leak', 'electrical', 'not working', 'broken', 'clog', 'overflow',
-        'pest', 'mold', 'no hot water', 'water damage', 'exposed pipe',
-        'major', 'severe', 'serious', 'extensive', 'flood', 'burst'
-    ]
-    
-    # Medium urgency indicators (level 2)
-    medium_keywords = [
-        'slow', 'drip', 'minor', 'cosmetic', 'paint', 'scratch',
-        'loose', 'stain', 'sticking', 'noisy', 'peeling', 'small',
-        'squeak', 'stuck', 'difficult'
-    ]
-    
-    # Check for critical urgency
-    if any(keyword in text_lower for keyword in critical_keywords):
-        return 4
-    
-    # Check for high urgency
-    if any(keyword in text_lower for keyword in high_keywords):
-        return 3
-    
-    # Check for medium urgency
-    if any(keyword in text_lower for keyword in medium_keywords):
-        return 2
-    
-    # Default to medium urgency
-    return 2
+    # Any critical keyword settles it (level 4); otherwise any high keyword means level 3.
+    # Medium-tier keywords (slow, drip, minor, ...) and no match both mean medium (level 2).
+    urgency = 2
+    for _, (_, tiers) in URGENCY_AUTOMATON.iter(text.lower()):
+        if "critical" in tiers:
+            return 4
+        urgency = 3
+    
+    return urgency
+
+# Urgency level to text
+URGENCY_TEXT = {
+    1: "Low",
+    2: "Medium",
+    3: "High",
+    4: "Critical"
+}
 
 async def generate_comprehensive_analysis(text: str, summary: str, urgency_level: int) -> Dict[str, Any]:
     """Generate comprehensive analysis of the maintenance request"""
     
     # Use your existing analyzer for detailed analysis
-    basic_analysis = enhance_analysis_with_context(text.lower())
-    
-    # Map urgency level to text
-    urgency_map = {
-        1: "Low",
-        2: "Medium", 
-        3: "High",
-        4: "Critical"
-    }
+    basic_analysis = enhance_analysis_with_context(text)
     
     # Generate comprehensive report using your existing analyzer
-    comprehensive_report = advanced_analyzer.generate_maintenance_report_tagalog(summary, basic_analysis)
+    comprehensive_report = await generate_maintenance_report(summary, basic_analysis)
     
     return {
         "summary": summary,
         "urgency_level": urgency_level,
-        "urgency_text": urgency_map.get(urgency_level, "Medium"),
+        "urgency_text": URGENCY_TEXT.get(urgency_level, "Medium"),
         "components_identified": basic_analysis.get("components", []),
         "problems_detected": basic_analysis.get("problems", []),
         "severity_assessment": basic_analysis.get("severity_level", "mababa"),
@@ -1714,12 +2531,43 @@ async def generate_comprehensive_analysis(text: str, summary: str, urgency_level
         "confidence_score": basic_analysis.get("confidence", "medium")
     }
 
-async def fallback_request_analysis(data: dict) -> JSONResponse:
+class AnalyzeRequestIn(BaseModel):
+    """Body of /analyze-request (the frontend may send null for either field)"""
+    userText: Optional[str] = None
+    imageDescriptions: Optional[List[str]] = None
+
+
+# Bounds on the request text sent to the summary / urgency providers (~500 tokens in total)
+MAX_IMAGE_DESCRIPTION_CHARS = 500
+MAX_COMBINED_TEXT_CHARS = 2000
+
+# Requests shorter than this (in words) skip the AI providers: a summary would just echo the input
+MIN_AI_REQUEST_WORDS = 12
+
+
+def combine_request_text(user_text: Optional[str], image_descriptions: Optional[List[str]]) -> str:
+    """User text plus the distinct image descriptions, whitespace-collapsed and capped in length"""
+    # Repeated captions (e.g. the same photo uploaded twice) add prompt tokens but no information
+    descriptions = [description[:MAX_IMAGE_DESCRIPTION_CHARS] for description in dict.fromkeys(image_descriptions or [])]
+    combined_text = " ".join(" ".join([user_text or "", *descriptions]).split())
+    return combined_text[:MAX_COMBINED_TEXT_CHARS]
+
+
+# Fixed part of the fallback comprehensiveAnalysis (serialized only, so one shared copy is safe)
+FALLBACK_ANALYSIS_FIELDS = {
+    "components_identified": (),
+    "problems_detected": (),
+    "severity_assessment": "mababa",
+    "risk_level": "low",
+    "maintenance_priority": "low",
+    "confidence_score": "low",
+    "fallback_used": True
+}
+
+
+async def fallback_request_analysis(data: AnalyzeRequestIn) -> ORJSONResponse:
     """Fallback analysis when AI services fail"""
-    user_text = data.get("userText", "")
-    image_descriptions = data.get("imageDescriptions", [])
-    
-    combined_text = user_text + " " + " ".join(image_descriptions)
+    combined_text = combine_request_text(data.userText, data.imageDescriptions)
     
     # Simple fallback summarization
     summary = rule_based_summarization(combined_text)
@@ -1727,21 +2575,15 @@ async def fallback_request_analysis(data: dict) -> JSONResponse:
     # Simple fallback urgency classification
     urgency_level = rule_based_urgency_classification(combined_text)
     
-    return JSONResponse({
+    return ORJSONResponse({
         "success": True,
         "summary": summary,
         "urgencyLevel": urgency_level,
         "comprehensiveAnalysis": {
             "summary": summary,
             "urgency_level": urgency_level,
-            "urgency_text": ["Low", "Medium", "High", "Critical"][urgency_level - 1],
-            "components_identified": [],
-            "problems_detected": [],
-            "severity_assessment": "mababa",
-            "risk_level": "low",
-            "maintenance_priority": "low",
-            "confidence_score": "low",
-            "fallback_used": True
+            "urgency_text": URGENCY_TEXT.get(urgency_level, "Medium"),
+            **FALLBACK_ANALYSIS_FIELDS
         },
         "fallback": True,
         "timestamp": datetime.now().isoformat()
@@ -1754,10 +2596,22 @@ from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global report_pool
     # Startup
+    if REPORT_WORKERS > 0:
+        report_pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
     await load_models()
+    blip_batcher.start()
+    expansion_batcher.start()
+    get_http_session()
     yield
-    # Shutdown would go here
+    # Shutdown
+    await blip_batcher.stop()
+    await expansion_batcher.stop()
+    await close_http_session()
+    if report_pool is not None:
+        report_pool.shutdown(wait=False)
+        report_pool = None
 
 app = FastAPI(
     title="Advanced Maintenance Analysis API - Enhanced Tagalog System",
@@ -1765,32 +2619,134 @@ app = FastAPI(
     version="3.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS configuration
+# CORS configuration. The Next.js API routes call this service server-side, so only origins that
+# reach it straight from a browser need listing (comma-separated CORS_ALLOWED_ORIGINS).
+CORS_ALLOWED_ORIGINS = [
+    origin.strip() for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",") if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Adjust for production
+    allow_origins=CORS_ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
+    # Let browsers cache preflight responses for a day
+    max_age=86400,
 )
 
 
+def model_load_kwargs() -> Dict[str, Any]:
+    """Build from_pretrained kwargs for the configured precision / BLIP_QUANT mode"""
+    kwargs = {"torch_dtype": MODEL_DTYPE}
+    
+    if BLIP_QUANT == "none":
+        return kwargs
+    if DEVICE != "cuda":
+        # CPU int8 is applied after loading by quantize_for_cpu
+        if BLIP_QUANT != "int8":
+            logger.warning(f"BLIP_QUANT={BLIP_QUANT} requires CUDA, loading unquantized weights")
+        return kwargs
+    
+    if BLIP_QUANT == "int8":
+        kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+    elif BLIP_QUANT == "nf4":
+        kwargs["quantization_config"] = BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_compute_dtype=MODEL_DTYPE
+        )
+    else:
+        logger.warning(f"Unknown BLIP_QUANT={BLIP_QUANT}, loading unquantized weights")
+        return kwargs
+    
+    # bitsandbytes places the weights itself; the model must not be moved afterwards
+    kwargs["device_map"] = "auto"
+    return kwargs
+
+
+def quantize_for_cpu(model):
+    """Dynamic int8 quantization of the Linear layers for CPU inference"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def compile_blip_model(model):
+    """Compile the BLIP vision encoder and text decoder forwards with torch.compile"""
+    # generate() calls the submodules directly, so compile their forwards rather than
+    # wrapping the whole model. The vision input is a fixed 384x384 so CUDA graphs apply;
+    # the decoder grows one token per step, so it is compiled with dynamic shapes.
+    model.vision_model.forward = torch.compile(model.vision_model.forward, mode="reduce-overhead", fullgraph=False)
+    model.text_decoder.forward = torch.compile(model.text_decoder.forward, dynamic=True, fullgraph=False)
+    return model
+
+
+def compile_blip2_model(model):
+    """Compile the BLIP-2 vision encoder and Q-Former forwards with torch.compile"""
+    # Both see fixed shapes (224x224 pixels, 32 query tokens); the OPT decoder is left eager
+    # because its generate loop changes shape every step
+    model.vision_model.forward = torch.compile(model.vision_model.forward, mode="reduce-overhead", fullgraph=False)
+    model.qformer.forward = torch.compile(model.qformer.forward, mode="reduce-overhead", fullgraph=False)
+    return model
+
+
+def trace_blip_vision_model(model):
+    """Swap the BLIP vision encoder for a frozen TorchScript trace (CPU inference)"""
+    # Tuple outputs keep the trace free of ModelOutput dicts
+    model.vision_model.config.torchscript = True
+    example = torch.zeros(2, 3, 384, 384, dtype=MODEL_DTYPE)
+    with torch.no_grad():
+        traced = torch.jit.trace(model.vision_model, example)
+    model.vision_model = torch.jit.optimize_for_inference(traced)
+    return model
+
+
+def warmup_models():
+    """Run dummy captions so compilation and CUDA graph capture happen before the first request"""
+    try:
+        dummy = Image.new("RGB", (384, 384))
+        # Inductor's CUDA graphs warm up on the first call and record on the next, so run the
+        # same encode/decode path the request handlers use twice
+        for _ in range(2):
+            decode_blip_captions(encode_caption_images([dummy]), BLIP_CAPTION_PROMPTS[0])
+            if model_blip2 is not None:
+                generate_blip2_captions([dummy])
+        if DEVICE == "cuda":
+            torch.cuda.synchronize()
+        logger.info("BLIP warm-up completed")
+    except Exception as e:
+        logger.warning(f"BLIP warm-up failed: {e}")
+
+
 async def load_models():
     """Load all required models when the application starts"""
-    global processor_blip, model_blip, processor_blip2, model_blip2
+    global processor_blip, model_blip, processor_blip2, model_blip2, blip_prompt_ids
     
     try:
-        logger.info("Loading BLIP model...")
+        load_kwargs = model_load_kwargs()
+        quantized = "quantization_config" in load_kwargs
+        
+        logger.info(f"Loading BLIP model (quantization: {BLIP_QUANT if quantized else 'none'})...")
         processor_blip = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-large")
-        model_blip = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-large")
+        # Caption prompts are fixed, so tokenize them once instead of on every decode
+        blip_prompt_ids = {
+            prompt: processor_blip.tokenizer(prompt, return_tensors="pt").input_ids
+            for prompt in BLIP_CAPTION_PROMPTS if prompt != "a photo of"
+        }
+        model_blip = BlipForConditionalGeneration.from_pretrained(
+            "Salesforce/blip-image-captioning-large",
+            **load_kwargs
+        ).eval()
         
         logger.info("Loading BLIP-2 model...")
         try:
             processor_blip2 = Blip2Processor.from_pretrained("Salesforce/blip2-opt-2.7b")
-            model_blip2 = Blip2ForConditionalGeneration.from_pretrained("Salesforce/blip2-opt-2.7b")
+            model_blip2 = Blip2ForConditionalGeneration.from_pretrained(
+                "Salesforce/blip2-opt-2.7b",
+                **load_kwargs
+            ).eval()
             logger.info("BLIP-2 model loaded successfully!")
         except Exception as e:
             logger.warning(f"BLIP-2 model failed to load: {e}")
@@ -1798,14 +2754,49 @@ async def load_models():
             processor_blip2 = None
             model_blip2 = None
         
-        # Move models to GPU if available
-        if torch.cuda.is_available():
-            model_blip = model_blip.to("cuda")
+        # Move models to GPU if available (quantized models are already placed)
+        if quantized:
+            logger.info(f"Models quantized to {BLIP_QUANT} on GPU")
+        elif DEVICE == "cuda":
+            # Input resolution is fixed, so let cuDNN pick the fastest conv kernels once
+            torch.backends.cudnn.benchmark = True
+            model_blip = model_blip.to(DEVICE)
             if model_blip2:
-                model_blip2 = model_blip2.to("cuda")
-            logger.info("Models moved to GPU")
+                model_blip2 = model_blip2.to(DEVICE)
+            logger.info(f"Models moved to GPU ({MODEL_DTYPE})")
         else:
-            logger.info("Using CPU for inference")
+            if BLIP_QUANT == "int8":
+                if MODEL_DTYPE == torch.float32:
+                    model_blip = quantize_for_cpu(model_blip)
+                    if model_blip2:
+                        model_blip2 = quantize_for_cpu(model_blip2)
+                    logger.info("Models dynamically quantized to int8 on CPU")
+                else:
+                    logger.warning("BLIP_QUANT=int8 on CPU needs float32 weights, skipping quantization")
+            torch.set_num_threads(TORCH_NUM_THREADS)
+            try:
+                torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+            except RuntimeError as e:
+                # Only settable before the first inter-op parallel work
+                logger.warning(f"Could not set inter-op threads: {e}")
+            logger.info(f"Using CPU for inference ({MODEL_DTYPE}, {TORCH_NUM_THREADS} threads)")
+        
+        if BLIP_TORCHSCRIPT and not BLIP_COMPILE and DEVICE == "cpu":
+            logger.info("Tracing BLIP vision encoder with TorchScript...")
+            try:
+                model_blip = trace_blip_vision_model(model_blip)
+                warmup_models()
+            except Exception as e:
+                logger.warning(f"TorchScript tracing failed, using eager encoder: {e}")
+        
+        if BLIP_COMPILE:
+            logger.info("Compiling BLIP with torch.compile...")
+            # Batch sizes vary per request; the default limit of 8 graphs per frame would fall back to eager
+            torch._dynamo.config.cache_size_limit = 64
+            model_blip = compile_blip_model(model_blip)
+            if model_blip2 is not None:
+                model_blip2 = compile_blip2_model(model_blip2)
+            warmup_models()
             
         logger.info("All models loaded successfully!")
         
@@ -1818,17 +2809,34 @@ async def load_models():
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = datetime.now()
-    logger.info(f"Incoming request: {request.method} {request.url}")
+    # Skip formatting entirely when INFO is disabled; the path avoids rebuilding the full URL
+    if not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
+    
+    start_time = time.perf_counter()
+    logger.info("Incoming request: %s %s", request.method, request.url.path)
     
     response = await call_next(request)
     
-    process_time = (datetime.now() - start_time).total_seconds()
-    logger.info(f"Response status: {response.status_code} - Process time: {process_time:.2f}s")
+    process_time = time.perf_counter() - start_time
+    logger.info("Response status: %s - Process time: %.2fs", response.status_code, process_time)
     
     return response
 
 
+@app.middleware("http")
+async def limit_request_size(request: Request, call_next):
+    # Refuse oversized bodies up front, before the multipart parser spools them
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > MAX_REQUEST_BYTES:
+        return ORJSONResponse({
+            "success": False,
+            "error": "Request body too large"
+        }, status_code=413)
+    
+    return await call_next(request)
+
+
 # API ENDPOINTS
 
 @app.get("/")
@@ -1872,32 +2880,31 @@ async def analyze_image_advanced(file: UploadFile = File(...)):
         
         logger.info(f"Advanced processing of image: {file.filename}")
         
-        # Read and process image
-        image_data = await file.read()
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Validate image size
-        if image.size[0] < 100 or image.size[1] < 100:
-            raise HTTPException(status_code=400, detail="Image is too small for analysis")
-        
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Enhanced image processing
-        enhanced_image = enhanced_image_processing(image)
+        loop = asyncio.get_running_loop()
         
-        # Step 1: Generate basic description
-        try:
-            basic_description = multi_model_caption_generation(enhanced_image)
-        except Exception as local_error:
-            logger.warning(f"Local model processing failed: {local_error}")
-            basic_description = await analyze_with_hf_api_advanced(image_data, file.filename)
+        # Step 1: Generate basic description (cached by content, batched with concurrent requests).
+        # The spooled upload is hashed and decoded in place rather than copied into one bytes object;
+        # a cache hit skips decoding entirely, re-checking the minimum size against the cached dimensions.
+        image_key = await loop.run_in_executor(image_pool, hash_upload, file.file)
+        cached = caption_cache.get(image_key)
+        if cached is not None:
+            basic_description, shorter_side = cached
+            check_image_size(shorter_side, 100)
+        else:
+            # Validate, decode and enhance the image off the event loop
+            enhanced_image, shorter_side = await loop.run_in_executor(image_pool, load_caption_image, file.file, 100)
+            try:
+                basic_description = await blip_batcher.submit(enhanced_image)
+            except Exception as local_error:
+                logger.warning(f"Local model processing failed: {local_error}")
+                await file.seek(0)
+                basic_description = await analyze_with_hf_api_advanced(await file.read(), file.filename)
+            caption_cache.set(image_key, (basic_description, shorter_side))
         
         logger.info(f"Basic description: {basic_description}")
         
         # Step 2: Analyze for maintenance context
-        basic_analysis = enhance_analysis_with_context(basic_description.lower())
+        basic_analysis = enhance_analysis_with_context(basic_description)
         
         # Step 3: Expand description with AI for maintenance context
         expanded_description = await expand_description_with_ai(basic_description, basic_analysis)
@@ -1909,14 +2916,14 @@ async def analyze_image_advanced(file: UploadFile = File(...)):
         logger.info(f"Tenant voice description: {tenant_voice_description}")
         
         # Step 5: Generate comprehensive report
-        comprehensive_report = advanced_analyzer.generate_maintenance_report_tagalog(
+        comprehensive_report = await generate_maintenance_report(
             expanded_description, 
             basic_analysis
         )
         
         logger.info(f"Advanced analysis completed for {file.filename}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "description": tenant_voice_description,
             "maintenance_issue": tenant_voice_description,
@@ -1935,9 +2942,18 @@ async def analyze_image_advanced(file: UploadFile = File(...)):
             "timestamp": datetime.now().isoformat()
         })
         
+    except HTTPException as e:
+        # Validation errors (not an image, too small, too large) keep their 4xx status and the usual body
+        logger.warning(f"Rejected {file.filename}: {e.detail}")
+        return ORJSONResponse({
+            "success": False,
+            "error": e.detail,
+            "processing_level": "advanced",
+            "timestamp": datetime.now().isoformat()
+        }, status_code=e.status_code)
     except Exception as e:
         logger.error(f"Advanced image analysis failed: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "success": False,
             "error": str(e),
             "processing_level": "advanced",
@@ -1945,35 +2961,79 @@ async def analyze_image_advanced(file: UploadFile = File(...)):
         }, status_code=500)
 
 
+def rejected_upload_result(filename: str, error: HTTPException) -> Dict[str, Any]:
+    """Per-file result for an upload rejected by validation (too large, too small, unreadable)"""
+    logger.warning(f"Rejected {filename}: {error.detail}")
+    return {
+        "filename": filename,
+        "success": False,
+        "error": error.detail,
+        "status_code": error.status_code
+    }
+
+
 @app.post("/analyze-multiple-images")
 async def analyze_multiple_images(files: List[UploadFile] = File(...)):
     """Advanced analysis of multiple images"""
-    results = []
+    results = [None] * len(files)
+    decoded = []
+    loop = asyncio.get_running_loop()
+    
+    async def read_and_decode(file: UploadFile):
+        image_key = await loop.run_in_executor(image_pool, hash_upload, file.file)
+        cached = caption_cache.get(image_key)
+        # Cached uploads skip the decode as well as BLIP
+        if cached is not None:
+            caption, shorter_side = cached
+            return image_key, caption, None, shorter_side
+        image, shorter_side = await loop.run_in_executor(image_pool, load_caption_image, file.file)
+        return image_key, None, image, shorter_side
+    
+    # Read all uploads concurrently and decode them off the event loop,
+    # so BLIP can caption every new image in one batch
+    outcomes = await asyncio.gather(*(read_and_decode(file) for file in files), return_exceptions=True)
+    
+    for index, (file, outcome) in enumerate(zip(files, outcomes)):
+        if isinstance(outcome, HTTPException):
+            # Rejected upload (too large / unreadable): report it for this file, keep the others
+            results[index] = rejected_upload_result(file.filename, outcome)
+        elif isinstance(outcome, Exception):
+            logger.error(f"Failed to process {file.filename}: {outcome}")
+            results[index] = {
+                "filename": file.filename,
+                "success": False,
+                "error": str(outcome)
+            }
+        else:
+            image_key, caption, image, shorter_side = outcome
+            decoded.append((index, file, image_key, caption, image, shorter_side))
+    
+    # Only images not seen before go through BLIP
+    captions = [item[3] for item in decoded]
+    missing = [position for position, caption in enumerate(captions) if caption is None]
+    if missing:
+        generated = await loop.run_in_executor(
+            inference_pool, batch_caption_generation, [decoded[position][4] for position in missing]
+        )
+        for position, caption in zip(missing, generated):
+            captions[position] = caption
     
-    for file in files:
+    async def describe(index: int, file: UploadFile, image_key: bytes, caption: Optional[str], shorter_side: int):
         try:
-            # Process each file
-            image_data = await file.read()
-            image = Image.open(io.BytesIO(image_data))
-            
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            enhanced_image = enhanced_image_processing(image)
+            basic_description = caption
+            if basic_description is None:
+                logger.warning(f"Local processing failed for {file.filename}: all captioning strategies failed")
+                await file.seek(0)
+                basic_description = await analyze_with_hf_api_advanced(await file.read(), file.filename)
+            caption_cache.set(image_key, (basic_description, shorter_side))
             
-            try:
-                basic_description = multi_model_caption_generation(enhanced_image)
-            except Exception as local_error:
-                logger.warning(f"Local processing failed for {file.filename}: {local_error}")
-                basic_description = await analyze_with_hf_api_advanced(image_data, file.filename)
-            
-            basic_analysis = enhance_analysis_with_context(basic_description.lower())
+            basic_analysis = enhance_analysis_with_context(basic_description)
             expanded_description = await expand_description_with_ai(basic_description, basic_analysis)
             tagalog_outputs = await generate_tagalog_outputs(basic_description, expanded_description, basic_analysis)
             tenant_voice_description = tagalog_outputs["tenant_voice"]
-            comprehensive_report = advanced_analyzer.generate_maintenance_report_tagalog(expanded_description, basic_analysis)
+            comprehensive_report = await generate_maintenance_report(expanded_description, basic_analysis)
             
-            results.append({
+            results[index] = {
                 "filename": file.filename,
                 "success": True,
                 "description": tenant_voice_description,
@@ -1989,30 +3049,38 @@ async def analyze_multiple_images(files: List[UploadFile] = File(...)):
                 "comprehensive_report": comprehensive_report,
                 "analysis": basic_analysis,
                 "isMaintenanceRelated": basic_analysis["isMaintenanceRelated"]
-            })
+            }
             
+        except HTTPException as e:
+            results[index] = rejected_upload_result(file.filename, e)
         except Exception as e:
             logger.error(f"Failed to process {file.filename}: {e}")
-            results.append({
+            results[index] = {
                 "filename": file.filename,
                 "success": False,
                 "error": str(e)
-            })
+            }
+    
+    # Expansion and translation are network-bound, so run every image's pipeline concurrently
+    await asyncio.gather(*(
+        describe(index, file, image_key, caption, shorter_side)
+        for (index, file, image_key, _, _, shorter_side), caption in zip(decoded, captions)
+    ))
     
     return {"results": results}
 
 
 @app.post("/analyze-request")
-async def analyze_request(data: dict = Body(...)):
+async def analyze_request(data: AnalyzeRequestIn):
     """
     Analyze maintenance request text for summarization and urgency classification
     """
     try:
-        user_text = data.get("userText", "")
-        image_descriptions = data.get("imageDescriptions", [])
+        user_text = data.userText or ""
+        image_descriptions = data.imageDescriptions or []
         
         if not user_text and not image_descriptions:
-            return JSONResponse({
+            return ORJSONResponse({
                 "success": False,
                 "error": "No content provided for analysis"
             }, status_code=400)
@@ -2020,27 +3088,32 @@ async def analyze_request(data: dict = Body(...)):
         logger.info(f"Analyzing request: {user_text[:100]}... with {len(image_descriptions)} image descriptions")
         
         # Combine user text and image descriptions
-        combined_text = user_text
-        if image_descriptions:
-            combined_text += " " + " ".join(image_descriptions)
-        
-        # Step 1: Summarize the request using AI
-        summary = await summarize_request_with_ai(combined_text)
-        
-        # Step 2: Classify urgency using AI
-        urgency_level = await classify_urgency_with_ai(combined_text)
+        combined_text = combine_request_text(user_text, image_descriptions)
+        
+        # Steps 1-2: Summarize and classify urgency concurrently (independent AI calls),
+        # or locally when the text is too short for the providers to add anything
+        fast_path = len(combined_text.split()) < MIN_AI_REQUEST_WORDS
+        if fast_path:
+            summary = rule_based_summarization(combined_text)
+            urgency_level = rule_based_urgency_classification(combined_text)
+        else:
+            summary, urgency_level = await asyncio.gather(
+                summarize_request_with_ai(combined_text),
+                classify_urgency_with_ai(combined_text)
+            )
         
         # Step 3: Generate comprehensive analysis
         comprehensive_analysis = await generate_comprehensive_analysis(combined_text, summary, urgency_level)
         
         logger.info(f"Request analysis completed - Urgency: {urgency_level}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "summary": summary,
             "urgencyLevel": urgency_level,
             "comprehensiveAnalysis": comprehensive_analysis,
             "processing_level": "advanced_request_analysis",
+            "fast_path": fast_path,
             "timestamp": datetime.now().isoformat()
         })
         
@@ -2058,16 +3131,16 @@ async def generate_maintenance_plan(data: dict = Body(...)):
         user_context = data.get("user_context", "")
         
         if not descriptions and not user_context:
-            return JSONResponse({"error": "No content provided"}, status_code=400)
+            return ORJSONResponse({"error": "No content provided"}, status_code=400)
         
         # Combine all descriptions
         combined_text = " ".join(descriptions) + " " + user_context
         
         # Generate comprehensive plan using advanced analyzer
-        basic_analysis = enhance_analysis_with_context(combined_text.lower())
-        plan = advanced_analyzer.generate_maintenance_report_tagalog(combined_text, basic_analysis)
+        basic_analysis = enhance_analysis_with_context(combined_text)
+        plan = await generate_maintenance_report(combined_text, basic_analysis)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "maintenance_plan": plan,
             "summary": f"Generated comprehensive plan for {len(descriptions)} issues",
@@ -2076,14 +3149,19 @@ async def generate_maintenance_plan(data: dict = Body(...)):
         
     except Exception as e:
         logger.error(f"Maintenance plan generation failed: {e}")
-        return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"success": False, "error": str(e)}, status_code=500)
 
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
+    # uvicorn[standard] provides uvloop and httptools, which "auto" picks up. Each worker
+    # loads its own copy of the models, so extra workers are opt-in via WEB_CONCURRENCY.
     uvicorn.run(
-        app, 
+        "main:app", 
         host="0.0.0.0", 
         port=port,
+        workers=int(os.getenv("WEB_CONCURRENCY", 1)),
+        loop="auto",
+        http="auto",
         log_config=None
     )
\ No newline at end of file